@@ -0,0 +1,103 @@
+"""
+Benchmark map payload size and render time per boundary detail level.
+
+Runs on the bundled boundary file and on synthetic high-resolution
+boundaries (a jagged outline of VERTICES points around each state's tile
+position) that stand in for a full-resolution file. Both are read through
+geometry.load_boundaries. For each level, the benchmark reports the
+simplification time, the vertices kept, the geometry payload, and the time
+to build and serialize the animated figure.
+
+It also compares the payload of the animated figure (geometry sent once,
+frames carry z) with rebuilding one single-year figure per year.
+
+Usage:
+    python -m benchmarks.bench_choropleth
+"""
+import json
+import os
+import tempfile
+import time
+import numpy as np
+from utils.animation import create_animated_choropleth
+from utils.constants import state_tiles
+from utils.geometry import (
+    BOUNDARIES_PATH, TILE_ORIGIN, TILE_STEP, TOLERANCES, boundaries_available, load_boundaries, simplify_boundaries
+)
+
+VERTICES = 20000
+YEARS = np.arange(2013, 2023)
+
+def synthetic_boundaries(vertices=VERTICES, seed=0):
+    """GeoJSON FeatureCollection with one jagged outline per state."""
+    rng = np.random.default_rng(seed)
+    angles = np.linspace(0, 2 * np.pi, vertices, endpoint=False)
+    features = []
+    for state, (row, col) in state_tiles.items():
+        cx = TILE_ORIGIN[0] + (col + 0.5) * TILE_STEP
+        cy = TILE_ORIGIN[1] - (row + 0.5) * TILE_STEP
+        # Smooth large-scale shape plus fine coastline-like detail
+        smooth = np.convolve(rng.normal(size=vertices), np.ones(500) / 500, mode="same") * 8
+        radius = TILE_STEP * 0.45 * (1 + 0.15 * smooth + 0.01 * rng.normal(size=vertices))
+        ring = np.column_stack([cx + radius * np.cos(angles), cy + radius * np.sin(angles)])
+        ring = np.vstack([ring, ring[:1]]).tolist()
+        features.append({
+            "type": "Feature",
+            "properties": {"ST_NM": state},
+            "geometry": {"type": "Polygon", "coordinates": [ring]},
+        })
+    return {"type": "FeatureCollection", "features": features}
+
+def _vertex_count(collection):
+    return sum(
+        len(ring)
+        for feature in collection["features"]
+        for polygon in feature["geometry"]["coordinates"]
+        for ring in polygon
+    )
+
+def report(features):
+    """Print one row per detail level for a list of boundary features."""
+    rng = np.random.default_rng(1)
+    state_ids = [feature["id"] for feature in features]
+    names = [feature["properties"]["name"] for feature in features]
+    values = rng.gamma(2.0, 50000, size=(len(state_ids), len(YEARS)))
+
+    print(f"{'detail':>8} {'simplify':>10} {'vertices':>10} {'geometry KB':>12} {'figure KB':>10} "
+          f"{'per-year KB':>12} {'build+json':>11}")
+    for detail, tolerance in [("Full", 0.0)] + list(TOLERANCES.items()):
+        start = time.perf_counter()
+        geojson = simplify_boundaries(features, tolerance)
+        simplify_s = time.perf_counter() - start
+        geometry_kb = len(json.dumps(geojson, separators=(",", ":"))) / 1e3
+
+        start = time.perf_counter()
+        fig = create_animated_choropleth(values, state_ids, names, YEARS, "Benchmark", "Value")
+        fig.update_traces(geojson=geojson)
+        figure_kb = len(fig.to_json()) / 1e3
+        render_s = time.perf_counter() - start
+
+        # Rebuilding a single-year figure per year resends the geometry every time
+        single = create_animated_choropleth(values[:, -1:], state_ids, names, YEARS[-1:], "Benchmark", "Value")
+        single.update_traces(geojson=geojson)
+        per_year_kb = len(single.to_json()) / 1e3 * len(YEARS)
+
+        print(f"{detail:>8} {simplify_s * 1000:>8.0f}ms {_vertex_count(geojson):>10,} {geometry_kb:>12,.0f} "
+              f"{figure_kb:>10,.0f} {per_year_kb:>12,.0f} {render_s * 1000:>9.0f}ms")
+
+def main():
+    if boundaries_available():
+        print(f"Bundled file: {os.path.getsize(BOUNDARIES_PATH) / 1e3:.0f} KB")
+        report(load_boundaries())
+        print()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "boundaries.geojson")
+        with open(path, "w") as f:
+            json.dump(synthetic_boundaries(), f)
+        print(f"Synthetic file: {os.path.getsize(path) / 1e6:.1f} MB, {len(state_tiles) * (VERTICES + 1):,} vertices")
+        features = load_boundaries(path)
+    report(features)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Benchmark the similarity subsystem as the entity count grows.
+
+Synthetic composition vectors stand in for entities beyond the 28 states
+(~700 districts and beyond). Times a full distance matrix + argsort for
+comparison, the blockwise k-NN that SimilarityIndex uses, and k-means.
+
+Usage:
+    python -m benchmarks.bench_similarity
+"""
+import time
+import numpy as np
+from utils.similarity import composition_vectors, kmeans, nearest_neighbors, pairwise_distances
+
+ENTITY_COUNTS = [28, 100, 700, 2000, 5000]
+N_COMPONENTS = 20
+K = 10
+REPEATS = 3
+
+def _best_of(fn, repeats=REPEATS):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'entities':>8} {'full matrix+sort':>17} {'blockwise kNN':>14} {'k-means(8)':>11} {'matrix MB':>10}")
+    for n in ENTITY_COUNTS:
+        vectors = composition_vectors(rng.gamma(1.0, size=(n, N_COMPONENTS)))
+        full = _best_of(lambda: np.argsort(pairwise_distances(vectors), axis=1))
+        blockwise = _best_of(lambda: nearest_neighbors(vectors, K))
+        clustering = _best_of(lambda: kmeans(vectors, 8))
+        matrix_mb = n * n * 8 / 1e6
+        print(f"{n:>8} {full * 1000:>15.1f}ms {blockwise * 1000:>12.1f}ms {clustering * 1000:>9.1f}ms {matrix_mb:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Profile memory allocated per rerun of the dashboard pages.
+
+Each page is run once to warm the caches, then rerun with tracemalloc on.
+For each rerun it records the peak bytes allocated above the starting level
+(the memory a rerun churns through) and the bytes still held afterwards.
+Streamlit's own testing harness takes part in every rerun, so compare
+numbers between checkouts rather than reading them as absolutes.
+
+Usage:
+    python -m benchmarks.profile_allocations
+"""
+import os
+import sys
+import tracemalloc
+from streamlit.testing.v1 import AppTest
+
+PAGES = [
+    "pages/1_State_Revenue_Receipts.py",
+    "pages/2_State_Revenue_Components.py",
+    "pages/4_State_Capex_Components.py",
+    "pages/5_State_Revex_Components.py",
+]
+RERUNS = 5
+
+def profile_page(page, reruns=RERUNS):
+    """(median peak bytes, median retained bytes) over `reruns` warm reruns."""
+    app = AppTest.from_file(os.path.abspath(page), default_timeout=300).run()
+    if app.exception:
+        raise RuntimeError(f"{page}: {app.exception[0].value}")
+
+    peaks, retained = [], []
+    tracemalloc.start()
+    for _ in range(reruns):
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        app.run()
+        current, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - start)
+        retained.append(current - start)
+    tracemalloc.stop()
+    return sorted(peaks)[len(peaks) // 2], sorted(retained)[len(retained) // 2]
+
+def main():
+    sys.path.insert(0, os.getcwd())
+    print(f"{'page':<40} {'peak MB/rerun':>14} {'retained MB':>12}")
+    for page in PAGES:
+        peak, retained = profile_page(page)
+        print(f"{os.path.basename(page):<40} {peak / 1e6:>14.2f} {retained / 1e6:>12.2f}")
+
+if __name__ == "__main__":
+    main()
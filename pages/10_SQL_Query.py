@@ -0,0 +1,51 @@
+import sqlite3
+import streamlit as st
+from utils.sql_engine import EXAMPLE_QUERIES, MAX_ROWS, run_query, schema
+from utils.utils import download_cleaned_data
+
+# -------------------------
+# App Title
+# -------------------------
+st.set_page_config(page_title="SQL Query", layout="wide")
+st.title("🧮 SQL Query")
+st.caption("Read-only SQL (SQLite dialect) over the cleaned datasets. Years are start years, e.g. 2018 = 2018-19.")
+
+# -------------------------
+# Schema
+# -------------------------
+with st.expander("📚 Tables"):
+    for table, columns in schema().items():
+        st.markdown(f"**{table}**: " + ", ".join(f"`{name}` {kind}" for name, kind in columns))
+
+# -------------------------
+# Query
+# -------------------------
+example = st.selectbox("Examples", list(EXAMPLE_QUERIES))
+sql = st.text_area(
+    "Query (Ctrl+Enter to run)",
+    value=EXAMPLE_QUERIES[example],
+    height=220,
+    key=f"sql_{example}"
+)
+
+if sql.strip():
+    try:
+        result, truncated, execution_ms, served_ms = run_query(sql)
+    except sqlite3.Error as e:
+        st.error(f"⚠️ {e}")
+        st.stop()
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Rows", f"{len(result):,}")
+    col2.metric("Execution Time", f"{execution_ms:.1f} ms")
+    col3.metric("Served In", f"{served_ms:.1f} ms", help="Near zero when the result came from the query cache.")
+
+    if truncated:
+        st.warning(f"Showing the first {MAX_ROWS:,} rows; add a LIMIT or a narrower WHERE clause to see the rest.")
+    st.dataframe(result, hide_index=True, use_container_width=True)
+    st.download_button(
+        label="📥 Download Result",
+        data=download_cleaned_data(result),
+        file_name="query_result.csv",
+        mime="text/csv"
+    )
@@ -0,0 +1,44 @@
+import streamlit as st
+from utils.aggregates import build_metric_tensor
+from utils.animation import build_choropleth_playback
+from utils.constants import datasets
+from utils.geometry import BOUNDARIES_PATH, TOLERANCES, boundaries_available
+
+# -------------------------
+# App Title
+# -------------------------
+st.set_page_config(page_title="State Map", layout="wide")
+st.title("🗺️ State Map")
+
+tensor = build_metric_tensor()
+
+# -------------------------
+# Sidebar Filters
+# -------------------------
+st.sidebar.header("Filters")
+dataset = st.sidebar.selectbox("Dataset", list(datasets), format_func=lambda name: datasets[name][0])
+metric = st.sidebar.selectbox("Metric", tensor.metrics_for(dataset))
+has_total = tensor.total_of[tensor.metric_index(metric)] >= 0
+by = st.sidebar.radio(
+    "Show",
+    ["value", "share"] if has_total else ["value"],
+    format_func=lambda x: "Value (₹ Crores)" if x == "value" else "Share of Dataset Total (%)"
+)
+detail = st.sidebar.select_slider(
+    "Boundary Detail",
+    options=list(TOLERANCES),
+    value="Medium",
+    disabled=not boundaries_available()
+)
+
+if not boundaries_available():
+    st.info(f"No boundary file at `{BOUNDARIES_PATH}`; showing a tile grid with one square per state.")
+
+# Geometry is sent once per figure, not once per year: the slider under the
+# map and the play button only swap values, in the browser. Changing the
+# metric, value/share or detail level re-sends the figure with its geometry.
+fig = build_choropleth_playback(metric, by, detail)
+if fig is None:
+    st.info(f"No data for {metric}.")
+else:
+    st.plotly_chart(fig, use_container_width=True)
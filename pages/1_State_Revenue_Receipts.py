@@ -1,9 +1,15 @@
+import numpy as np
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-from utils.constants import indian_states, state_to_initial, state_colors
-from utils.data_loader import load_state_finances
 import plotly.express as px
+from utils.constants import indian_states, state_to_initial
+from utils.data_loader import dataset_version, load_state_finances_long
+from utils.entities import states as entity_states
+from utils.aggregates import build_metric_tensor
+from utils.animation import build_metric_playback
+from utils.forecasting import METHODS, build_forecasts
+from utils.paginated_table import build_table_index, paginated_table
+from utils.ranking import build_ranking_engine
+from utils.utils import add_anomaly_markers, add_forecast_overlay, create_revenue_bar_chart
 
 # -------------------------
 # App Title
@@ -28,10 +34,7 @@ states_selected = st.sidebar.multiselect(
 extended_colors = px.colors.qualitative.Dark24 + px.colors.qualitative.Alphabet + px.colors.qualitative.Light24
 
 # Year selection for bar chart
-data = load_state_finances()
-data_long = data.melt(id_vars='States', var_name='Year', value_name='Value')
-data_long['Year'] = data_long['Year'].str[:4].astype(int)
-data_long['Initial'] = data_long['States'].map(state_to_initial)
+data_long = load_state_finances_long()
 
 year_min = int(data_long['Year'].min())
 year_max = int(data_long['Year'].max())
@@ -42,8 +45,20 @@ year_selected = st.sidebar.slider(
     year_min
 )
 
+# Forecast overlay for the line chart
+show_forecast = st.sidebar.checkbox("Show Forecast", value=False)
+forecast_method = st.sidebar.selectbox(
+    "Forecast Method",
+    list(METHODS),
+    format_func=METHODS.get,
+    disabled=not show_forecast
+)
+
+# Anomalies precomputed with the metric tensor
+show_anomalies = st.sidebar.checkbox("Highlight Anomalies", value=True)
+
 # Filter selected states
-data_long_filtered = data_long[data_long['States'].isin(states_selected)]
+data_long_filtered = data_long[data_long['state_id'].isin(entity_states.encode(states_selected))]
 
 # -------------------------
 # Tabs
@@ -55,33 +70,27 @@ tab1, tab2 = st.tabs(["Bar Chart", "Line Chart"])
 # -------------------------
 with tab1:
     st.subheader(f"Revenue Bar Chart for {year_selected}")
+    animate = st.checkbox("▶ Play Through Years", value=False, key="tab1_animate")
 
-    data_year = data_long_filtered[data_long_filtered['Year'] == year_selected].sort_values("Value", ascending=True)
-
-    fig_bar = px.bar(
-        data_year,
-        x="Value",
-        y="States",
-        orientation='h',
-        text="Initial",
-        color="States",
-        color_discrete_map=state_colors,
-        labels={"Value": "Revenue (₹ Crores)", "States": "State"},
-        template="plotly_white",
-        hover_data={"Value": ":,.0f", "Initial": True}
-    )
-    fig_bar.update_traces(textposition="outside", textfont_size=12)
-    fig_bar.update_layout(
-        yaxis=dict(autorange="reversed"),
-        xaxis=dict(separatethousands=True, tickprefix="₹"),
-        showlegend=False,
-        height=700,
-        margin=dict(l=150, r=50, t=50, b=50),
-        font=dict(family="Arial", size=14),
-        title_text=f"Revenue by State ({year_selected})",
-        title_font=dict(size=20, family="Arial")
-    )
-    st.plotly_chart(fig_bar, use_container_width=True)
+    if animate:
+        # All years in one figure; the year slider and play button run client-side
+        fig_bar = build_metric_playback(
+            "Revenue Receipts: Revenue Receipts",
+            year_selected,
+            "Revenue by State",
+            "Revenue (₹ Crores)",
+            selected_states=tuple(states_selected)
+        )
+    else:
+        # Precomputed ranking, smallest first, restricted to the selected states
+        state_ids = build_ranking_engine().sort_order("Revenue Receipts: Revenue Receipts", year_selected)[::-1]
+        state_ids = state_ids[np.isin(state_ids, entity_states.encode(states_selected))]
+        data_year = data_long_filtered[data_long_filtered['Year'] == year_selected].set_index('state_id').loc[state_ids].reset_index()
+        fig_bar = create_revenue_bar_chart(data_year, year_selected)
+    if fig_bar is None:
+        st.info("No data for the selected states.")
+    else:
+        st.plotly_chart(fig_bar, use_container_width=True)
 
 # -------------------------
 # Tab 2: Line Chart
@@ -114,10 +123,33 @@ with tab2:
         title_text="Revenue Trends Across States",
         title_font=dict(size=20, family="Arial")
     )
+    if show_forecast:
+        forecasts = build_forecasts(forecast_method, horizon=2)
+        projected = forecasts.metric("Revenue Receipts: Revenue Receipts")
+        add_forecast_overlay(fig_line, {
+            state: (forecasts.years, projected[state_id])
+            for state, state_id in zip(states, entity_states.encode(states))
+        })
+    if show_anomalies:
+        anomalies = build_metric_tensor().anomalies("revenue_receipts")
+        anomalies = anomalies[anomalies['state'].isin(states)]
+        add_anomaly_markers(fig_line, anomalies['year'], anomalies['value'], anomalies['state'])
     st.plotly_chart(fig_line, use_container_width=True)
 
 # -------------------------
 # Optional: Data Table
 # -------------------------
 with st.expander("View Revenue Data Table"):
-    st.dataframe(data_long_filtered.sort_values(["Year", "Value"], ascending=[False, False]).reset_index(drop=True))
+    table_index = build_table_index(
+        f"revenue_receipts:{dataset_version()}",
+        data_long[['States', 'Initial', 'Year', 'Value']],
+        {"Year, Value": ["Year", "Value"], "Value": ["Value"], "State": ["States"]},
+        filter_columns=("States",)
+    )
+    paginated_table(
+        table_index,
+        key="revenue_table",
+        filters={"States": states_selected},
+        default_sort="Year, Value",
+        default_descending=True
+    )
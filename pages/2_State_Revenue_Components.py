@@ -1,7 +1,9 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from utils.data_loader import load_state_revenue_components
+from utils.data_loader import dataset_version, load_state_revenue_components, load_state_revenue_totals, reconcile_totals
+from utils.disk_cache import disk_cache
+from utils.entities import unmatched_report
 
 # =====================================================
 # 🧠 CONFIG & SETUP
@@ -15,9 +17,16 @@ st.set_page_config(
 # =====================================================
 # ⚡ DATA LOADING (CACHED)
 # =====================================================
-@st.cache_data
+@st.cache_resource
+@disk_cache(version=dataset_version)
 def load_data():
+    """Revenue components with derived columns precomputed; shared across sessions, treat as read-only."""
     df_long = load_state_revenue_components()
+    totals = load_state_revenue_totals()
+
+    # Published total per state-year, used as the share-of-total denominator
+    published = totals.set_index(['State', 'Year'])['Total']
+    df_long['Total'] = published.reindex(pd.MultiIndex.from_arrays([df_long['State'], df_long['Year']])).to_numpy()
 
     # Ensure year order oldest → newest
     df_long['Year'] = pd.Categorical(
@@ -38,12 +47,26 @@ def load_data():
     df_long = df_long[df_long['Components'].isin(valid_components)]
     df_long['Components'] = pd.Categorical(df_long['Components'], categories=valid_components, ordered=True)
 
-    # Compute percentage of total per state-year
-    df_long['Percent'] = df_long['Value'] / df_long.groupby(['State','Year'])['Value'].transform('sum') * 100
+    # Compute percentage of published total per state-year
+    df_long['Percent'] = df_long['Value'] / df_long['Total'] * 100
+
+    # All-India "Total" rows, left out of the raw state comparison
+    df_long['Is Total'] = df_long['State'].str.contains("Total", case=False, na=False)
 
     return df_long
 
+@st.cache_data
+def load_reconciliation():
+    return reconcile_totals(
+        load_state_revenue_components(), load_state_revenue_totals(), ['State', 'Year'], 'Value', 'Total'
+    )
+
+@st.cache_resource
+def load_download_csv():
+    return load_data().drop(columns='Is Total').to_csv(index=False)
+
 df_long = load_data()
+reconciliation = load_reconciliation()
 
 # =====================================================
 # 🎨 COLOR MAP
@@ -81,12 +104,23 @@ cols[0].metric("📅 Latest Year", latest_year)
 cols[1].metric("💰 Total State Revenue", f"₹{latest_total:,} crore")
 cols[2].metric("🏦 Avg Own Tax Share", f"{own_tax_share:.1f}%")
 
+unmatched = unmatched_report(df_long, 'State', 'Components')
+if unmatched['states'] or unmatched['components']:
+    st.warning("⚠️ Names not in the canonical dictionary: " + ", ".join(unmatched['states'] + unmatched['components']))
+
+flagged = reconciliation[reconciliation['flagged']]
+with st.expander(f"🧮 Components vs Published Totals ({len(flagged)} mismatched state-years)"):
+    if flagged.empty:
+        st.success("All components add up to the published state totals.")
+    else:
+        st.dataframe(flagged.drop(columns='flagged').reset_index(drop=True), use_container_width=True)
+
 # =====================================================
 # 📂 DOWNLOAD BUTTON
 # =====================================================
 st.download_button(
     label="⬇️ Download Cleaned Data",
-    data=df_long.to_csv(index=False),
+    data=load_download_csv(),
     file_name="state_revenue_data.csv",
     mime="text/csv"
 )
@@ -112,7 +146,7 @@ with tab1:
         default=["Maharashtra", "Tamil Nadu"]
     )
 
-    df_view = df_long[df_long['State'].isin(states)].copy()
+    df_view = df_long[df_long['State'].isin(states)]
     fig = px.bar(
         df_view,
         x="Year",
@@ -139,7 +173,7 @@ with tab2:
         key="raw_states"
     )
 
-    df_view = df_long[df_long['State'].isin(states)].copy()
+    df_view = df_long[df_long['State'].isin(states)]
     fig = px.bar(
         df_view,
         x="Year",
@@ -160,7 +194,7 @@ with tab2:
 with tab3:
     st.subheader("Revenue Components by State (% of Total)")
     year = st.selectbox("Select Year", list(df_long['Year'].cat.categories), index=len(df_long['Year'].cat.categories)-1)
-    df_year = df_long[df_long['Year']==year].copy()
+    df_year = df_long[df_long['Year']==year]
 
     # Optional: add "All States" if needed, or skip "Total"
     # df_year['State'] = df_year['State'].replace("Total", "All States")
@@ -184,11 +218,8 @@ with tab3:
 with tab4:
     st.subheader("Revenue Components by State (₹ crore)")
     year = st.selectbox("Select Year", list(df_long['Year'].cat.categories), index=len(df_long['Year'].cat.categories)-1, key="raw_year")
-    df_year = df_long[df_long['Year']==year].copy()
-
-    # Remove any "Total" rows
-    df_year = df_year[~df_year['Components'].str.contains("Total", case=False, na=False)]
-    df_year = df_year[~df_year['State'].str.contains("Total", case=False, na=False)]
+    # Without the "Total" rows (load_data already keeps only real components)
+    df_year = df_long[(df_long['Year']==year) & ~df_long['Is Total']]
 
     fig = px.bar(
         df_year,
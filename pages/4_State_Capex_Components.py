@@ -7,5 +7,6 @@ create_expenditure_dashboard(
     tab1_title="📊 Capital Expenditure Composition (%)",
     tab2_title="💰 Capital Expenditure Composition (Raw)",
     tab3_title="📈 Component Share by State (%)",
-    tab4_title="📈 Component Share by State (Raw)"
+    tab4_title="📈 Component Share by State (Raw)",
+    dataset_name="capex_components"
 )
\ No newline at end of file
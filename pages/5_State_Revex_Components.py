@@ -7,5 +7,6 @@ create_expenditure_dashboard(
     tab1_title="📊 Revenue Expenditure Composition (%)",
     tab2_title="💰 Revenue Expenditure Composition (Raw)",
     tab3_title="📈 Component Share by State (%)",
-    tab4_title="📈 Component Share by State (Raw)"
+    tab4_title="📈 Component Share by State (Raw)",
+    dataset_name="revex_components"
 )
\ No newline at end of file
@@ -7,5 +7,6 @@ create_expenditure_dashboard(
     tab1_title="📊 Public Liability and Debt Composition (%)",
     tab2_title="💰 Public Liability and Debt Composition (Raw)",
     tab3_title="📈 Component Share by State (%)",
-    tab4_title="📈 Component Share by State (Raw)"
+    tab4_title="📈 Component Share by State (Raw)",
+    dataset_name="public_liability_debt"
 )
\ No newline at end of file
@@ -0,0 +1,116 @@
+import numpy as np
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+from utils.aggregates import build_metric_tensor
+from utils.constants import indian_state_initials, state_colors
+
+# -------------------------
+# App Title
+# -------------------------
+st.set_page_config(page_title="Cross-Metric Comparison", layout="wide")
+st.title("🔀 Cross-Metric Comparison")
+
+tensor = build_metric_tensor()
+labels = tensor.metric_labels
+states = tensor.states
+years = [int(y) for y in tensor.years]
+
+# -------------------------
+# Sidebar Filters
+# -------------------------
+st.sidebar.header("Metrics")
+metric_x = st.sidebar.selectbox(
+    "X Metric (denominator)",
+    labels,
+    index=labels.index("Revenue Receipts: Revenue Receipts")
+)
+metric_y = st.sidebar.selectbox(
+    "Y Metric (numerator)",
+    labels,
+    index=labels.index("Public Liability and Debt: Total")
+)
+year_selected = st.sidebar.select_slider("Year", options=years, value=years[-1])
+
+x_values = tensor.cell(metric_x, year_selected)
+y_values = tensor.cell(metric_y, year_selected)
+with np.errstate(divide='ignore', invalid='ignore'):
+    ratio = np.where(x_values != 0, y_values / x_values, np.nan)
+
+tab1, tab2, tab3 = st.tabs(["Scatter", "Ratio by State", "Ratio Over Time"])
+
+# -------------------------
+# Tab 1: Scatter
+# -------------------------
+with tab1:
+    st.subheader(f"{metric_y} vs {metric_x} ({year_selected})")
+    present = ~(np.isnan(x_values) | np.isnan(y_values))
+    fig = px.scatter(
+        x=x_values[present],
+        y=y_values[present],
+        text=np.array(indian_state_initials)[present],
+        color=states[present],
+        color_discrete_map=state_colors,
+        labels={"x": f"{metric_x} (₹ Crores)", "y": f"{metric_y} (₹ Crores)", "color": "State"},
+        template="plotly_white",
+        height=650
+    )
+    fig.update_traces(textposition="top center", marker=dict(size=12))
+    fig.update_layout(
+        xaxis=dict(separatethousands=True, tickprefix="₹"),
+        yaxis=dict(separatethousands=True, tickprefix="₹")
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    if not present.all():
+        st.caption(f"{int((~present).sum())} states have no data for one of the metrics in {year_selected}.")
+
+# -------------------------
+# Tab 2: Ratio by State
+# -------------------------
+with tab2:
+    st.subheader(f"{metric_y} ÷ {metric_x} ({year_selected})")
+    order = np.argsort(ratio)
+    order = order[~np.isnan(ratio[order])]
+    fig = go.Figure(go.Bar(
+        x=ratio[order],
+        y=states[order],
+        orientation='h',
+        marker_color=[state_colors[s] for s in states[order]],
+        hovertemplate="<b>%{y}</b><br>Ratio: %{x:.2f}<extra></extra>"
+    ))
+    fig.update_layout(
+        height=max(400, len(order) * 25),
+        xaxis_title="Ratio",
+        template="plotly_white",
+        margin=dict(l=150, r=50, t=30, b=50)
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+# -------------------------
+# Tab 3: Ratio Over Time
+# -------------------------
+with tab3:
+    st.subheader(f"{metric_y} ÷ {metric_x} Over Time")
+    selected = st.multiselect("Select States", list(states), default=list(states[:5]))
+    state_idx = np.flatnonzero(np.isin(states, selected))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_series = tensor.metric(metric_x)[state_idx]
+        ratios = np.where(x_series != 0, tensor.metric(metric_y)[state_idx] / x_series, np.nan)
+
+    fig = go.Figure()
+    for row, i in enumerate(state_idx):
+        fig.add_trace(go.Scatter(
+            x=years,
+            y=ratios[row],
+            mode="lines+markers",
+            name=states[i],
+            line=dict(color=state_colors[states[i]])
+        ))
+    fig.update_layout(
+        height=600,
+        xaxis=dict(tickmode='linear', dtick=1, title="Year"),
+        yaxis_title="Ratio",
+        hovermode="x unified",
+        template="plotly_white"
+    )
+    st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+import plotly.graph_objects as go
+from utils.constants import datasets, state_colors, state_to_initial
+from utils.ranking import build_ranking_engine
+
+# -------------------------
+# App Title
+# -------------------------
+st.set_page_config(page_title="State Rankings", layout="wide")
+st.title("🏆 State Rankings")
+
+ranking = build_ranking_engine()
+tensor = ranking.tensor
+states = tensor.states
+years = [int(y) for y in tensor.years]
+
+# -------------------------
+# Sidebar Filters
+# -------------------------
+st.sidebar.header("Filters")
+dataset = st.sidebar.selectbox("Dataset", list(datasets), format_func=lambda name: datasets[name][0])
+metric = st.sidebar.selectbox("Metric", tensor.metrics_for(dataset))
+# Share of the dataset total only exists for datasets with a published total
+has_total = tensor.total_of[tensor.metric_index(metric)] >= 0
+by = st.sidebar.radio(
+    "Rank By",
+    ["value", "share"] if has_total else ["value"],
+    format_func=lambda x: "Value (₹ Crores)" if x == "value" else "Share of Dataset Total (%)"
+)
+year_selected = st.sidebar.select_slider("Year", options=years, value=years[-1])
+k = st.sidebar.slider("Number of States (k)", 1, len(states), 5)
+
+source = tensor.values if by == "value" else ranking.shares
+m = tensor.metric_index(metric)
+y = tensor.year_index(year_selected)
+value_label = "Value (₹ Cr)" if by == "value" else "Share (%)"
+
+def leaderboard(state_ids):
+    """Table for a list of state IDs in display order."""
+    return pd.DataFrame({
+        "Rank": ranking.ranks[by][state_ids, y, m],
+        "State": states[state_ids],
+        "Initial": [state_to_initial[s] for s in states[state_ids]],
+        value_label: source[state_ids, y, m],
+    })
+
+if not ranking.sort_order(metric, year_selected, by).size:
+    st.info(f"No data for {metric} in {year_selected}.")
+    st.stop()
+
+tab1, tab2 = st.tabs(["Leaderboard", "Rank Over Time"])
+
+# -------------------------
+# Tab 1: Top-k / Bottom-k
+# -------------------------
+with tab1:
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader(f"Top {k} ({year_selected})")
+        st.dataframe(leaderboard(ranking.top_k(metric, year_selected, k, by)), hide_index=True, use_container_width=True)
+    with col2:
+        st.subheader(f"Bottom {k} ({year_selected})")
+        st.dataframe(leaderboard(ranking.bottom_k(metric, year_selected, k, by)), hide_index=True, use_container_width=True)
+
+# -------------------------
+# Tab 2: Rank Over Time
+# -------------------------
+with tab2:
+    st.subheader(f"Rank Over Time: {metric}")
+    default = list(states[ranking.top_k(metric, year_selected, 5, by)])
+    selected = st.multiselect("Select States", list(states), default=default)
+    history = ranking.rank_history(metric, by).astype(float)
+    history[history == 0] = np.nan
+
+    fig = go.Figure()
+    for i in np.flatnonzero(np.isin(states, selected)):
+        fig.add_trace(go.Scatter(
+            x=years,
+            y=history[i],
+            mode="lines+markers",
+            name=states[i],
+            line=dict(color=state_colors[states[i]]),
+            hovertemplate=f"<b>{states[i]}</b><br>Year: %{{x}}<br>Rank: %{{y}}<extra></extra>"
+        ))
+    fig.update_layout(
+        height=600,
+        xaxis=dict(tickmode='linear', dtick=1, title="Year"),
+        yaxis=dict(autorange="reversed", title="Rank", dtick=1),
+        template="plotly_white"
+    )
+    st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+import plotly.express as px
+from utils.constants import datasets, state_to_initial
+from utils.entities import states as entity_states
+from utils.similarity import METRICS, build_similarity_index
+from utils.utils import get_distinct_colors
+
+# -------------------------
+# App Title
+# -------------------------
+st.set_page_config(page_title="Fiscal Peers", layout="wide")
+st.title("👥 Fiscal Peers")
+st.caption("States whose composition (share of each component in the total) is most similar.")
+
+# -------------------------
+# Sidebar Filters
+# -------------------------
+COMPOSITION_DATASETS = ["revenue_components", "revex_capex", "capex_components", "revex_components", "public_liability_debt"]
+
+st.sidebar.header("Filters")
+dataset = st.sidebar.selectbox("Composition", COMPOSITION_DATASETS, format_func=lambda name: datasets[name][0])
+metric = st.sidebar.selectbox("Distance", list(METRICS), format_func=METRICS.get)
+
+index = build_similarity_index(dataset, metric)
+years = [int(y) for y in index.years]
+year_selected = st.sidebar.select_slider("Year", options=years, value=years[-1])
+
+tab1, tab2 = st.tabs(["Nearest Peers", "Clusters"])
+
+# -------------------------
+# Tab 1: Nearest Peers
+# -------------------------
+with tab1:
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        state = st.selectbox("State", list(index.states))
+    with col2:
+        k = st.slider("Number of Peers", 1, 10, 5)
+
+    state_id = entity_states.id_of(state)
+    peer_ids, peer_distances = index.peers(state_id, year_selected, k)
+    if not peer_ids.size:
+        st.info(f"No {datasets[dataset][0]} data for {state} in {year_selected}.")
+    else:
+        st.dataframe(
+            pd.DataFrame({
+                "State": index.states[peer_ids],
+                "Initial": [state_to_initial[s] for s in index.states[peer_ids]],
+                "Distance": peer_distances.round(4),
+            }),
+            hide_index=True,
+            use_container_width=True
+        )
+
+        # Composition of the state next to its peers
+        y = years.index(year_selected)
+        shown = np.concatenate([[state_id], peer_ids])
+        shares = index.vectors[y, shown] * 100
+        df_shares = pd.DataFrame(shares, columns=index.components)
+        df_shares["State"] = index.states[shown]
+        df_shares = df_shares.melt(id_vars="State", var_name="Component", value_name="Share (%)")
+        colors = dict(zip(index.components, get_distinct_colors(len(index.components))))
+        fig = px.bar(
+            df_shares,
+            x="Share (%)",
+            y="State",
+            color="Component",
+            orientation="h",
+            barmode="stack",
+            color_discrete_map=colors,
+            category_orders={"State": list(index.states[shown])},
+            height=max(350, len(shown) * 50),
+            title=f"{state} and its {len(peer_ids)} nearest peers ({year_selected})"
+        )
+        fig.update_xaxes(range=[0, 100])
+        st.plotly_chart(fig, use_container_width=True)
+
+# -------------------------
+# Tab 2: Clusters
+# -------------------------
+with tab2:
+    n_clusters = st.slider("Number of Clusters", 2, 8, 4)
+    state_ids, labels, projection = index.clusters(year_selected, n_clusters)
+    if not state_ids.size:
+        st.info(f"No {datasets[dataset][0]} data in {year_selected}.")
+    else:
+        df_clusters = pd.DataFrame({
+            "State": index.states[state_ids],
+            "Initial": [state_to_initial[s] for s in index.states[state_ids]],
+            "Cluster": [f"Cluster {label + 1}" for label in labels],
+            "PC1": projection[:, 0],
+            "PC2": projection[:, 1],
+        })
+        fig = px.scatter(
+            df_clusters,
+            x="PC1",
+            y="PC2",
+            color="Cluster",
+            text="Initial",
+            hover_data={"State": True, "PC1": False, "PC2": False},
+            category_orders={"Cluster": sorted(df_clusters["Cluster"].unique(), key=lambda c: int(c.split()[-1]))},
+            height=600,
+            template="plotly_white",
+            title=f"{datasets[dataset][0]} clusters ({year_selected})"
+        )
+        fig.update_traces(textposition="top center", marker=dict(size=12))
+        st.plotly_chart(fig, use_container_width=True)
+
+        with st.expander("Cluster Members"):
+            st.dataframe(
+                df_clusters.groupby("Cluster")["State"].apply(", ".join).reset_index(),
+                hide_index=True,
+                use_container_width=True
+            )
@@ -10,6 +10,11 @@ Welcome to the dashboard!
 Use the sidebar to explore different statistics:
 
 - 📊 State Revenue Receipts
+- 🔀 Cross-Metric Comparison
+- 🏆 State Rankings
+- 👥 Fiscal Peers
+- 🧮 SQL Query
+- 🗺️ State Map
 """)
 
 color_map = {state: state_colors1[i % len(state_colors1)] for i, state in enumerate(indian_states)}
@@ -0,0 +1,29 @@
+import numpy as np
+from utils.anomalies import THRESHOLD, rolling_level_scores, score_anomalies
+
+def _series(*values):
+    """One state, one metric."""
+    return np.array(values, dtype=float)[None, :, None]
+
+def _centre_scores(neighbours, centres):
+    before, after = neighbours[:2], neighbours[2:]
+    return np.array([rolling_level_scores(_series(*before, c, *after))[0, 2, 0] for c in centres])
+
+def test_level_scores_are_monotonic_across_deviations():
+    centres = np.linspace(0, 300, 601)
+    for neighbours in ([100, 102, 101, 99], [100, 130, 75, 110]):
+        scores = _centre_scores(neighbours, centres)
+        assert np.all(np.diff(scores) > -1e-9)
+
+    # No jump on either side of a 50% deviation
+    below, above = _centre_scores([100, 100, 100, 100], [149, 151])
+    assert above - below < 0.5
+
+def test_isolated_mistyped_level_is_flagged():
+    # A digit dropped from the first year of a steady series
+    _, _, flags = score_anomalies(_series(9999, 91978, 97483, 109842, 123291, 136002))
+    assert flags[0, :, 0].tolist() == [True, False, False, False, False, False]
+
+def test_deviation_in_a_noisy_series_is_not_flagged():
+    level = rolling_level_scores(_series(100, 130, 151, 75, 110))
+    assert abs(level[0, 2, 0]) < THRESHOLD
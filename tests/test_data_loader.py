@@ -0,0 +1,19 @@
+import builtins
+import utils.data_loader as data_loader
+
+def test_dataset_version_is_memoized_until_a_file_changes(tmp_path, monkeypatch):
+    paths = {}
+    for name in ("a", "b"):
+        paths[name] = tmp_path / f"{name}.csv"
+        paths[name].write_text("States,2013-14\nGoa,1\n")
+    monkeypatch.setattr(data_loader, "datasets", {name: (name, str(path)) for name, path in paths.items()})
+
+    first = data_loader.dataset_version()
+    opened = []
+    real_open = builtins.open
+    monkeypatch.setattr(builtins, "open", lambda *args, **kwargs: opened.append(args[0]) or real_open(*args, **kwargs))
+    assert data_loader.dataset_version() == first
+    assert opened == []
+
+    paths["b"].write_text("States,2013-14\nGoa,12\n")
+    assert data_loader.dataset_version() != first
@@ -0,0 +1,48 @@
+import os
+import pytest
+import utils.disk_cache as disk_cache
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(disk_cache, "CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+def _counting_function():
+    calls = []
+
+    @disk_cache.disk_cache()
+    def square(x):
+        calls.append(x)
+        return x * x
+    return square, calls
+
+def test_results_are_served_from_disk(cache_dir):
+    square, calls = _counting_function()
+    assert square(3) == 9
+    assert square(3) == 9
+    assert calls == [3]
+
+def test_code_change_invalidates_entries(cache_dir, monkeypatch):
+    square, calls = _counting_function()
+    square(3)
+    monkeypatch.setattr(disk_cache, "code_version", lambda extra_files=(): "changed")
+    square(3)
+    assert calls == [3, 3]
+
+def test_code_version_tracks_file_contents(tmp_path):
+    module = tmp_path / "helper.py"
+    module.write_text("THRESHOLD = 4.0\n")
+    before = disk_cache.code_version([module])
+    module.write_text("THRESHOLD = 3.5\n")
+    os.utime(module, ns=(1, 1))
+    assert disk_cache.code_version([module]) != before
+
+def test_corrupt_entries_are_recomputed(cache_dir):
+    square, calls = _counting_function()
+    square(4)
+    (entry,) = cache_dir.iterdir()
+    data = bytearray(entry.read_bytes())
+    data[-1] ^= 0xFF
+    entry.write_bytes(bytes(data))
+    assert square(4) == 16
+    assert calls == [4, 4]
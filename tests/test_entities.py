@@ -0,0 +1,19 @@
+import pandas as pd
+from utils.entities import add_entity_ids, states, unmatched_report
+
+def _frame(names):
+    return add_entity_ids(pd.DataFrame({'state': names, 'value': range(len(names))}), 'state')
+
+def test_unmatched_report_covers_only_its_own_frame():
+    first = _frame(["Kerala", "Atlantis"])
+    second = _frame(["Kerala", "Orissa", "All States"])
+    assert unmatched_report(first, 'state') == {"states": ["Atlantis"], "components": []}
+    # Orissa is an alias and All States an aggregate label; neither is reported
+    assert unmatched_report(second, 'state') == {"states": [], "components": []}
+
+def test_isin_keeps_unmatched_names_apart():
+    df = _frame(["Kerala", "Atlantis", "Lemuria", "Goa"])
+    assert (df['state_id'] < 0).sum() == 2
+    assert df.loc[states.isin(df['state_id'], df['state'], ["Atlantis"]), 'state'].tolist() == ["Atlantis"]
+    assert df.loc[states.isin(df['state_id'], df['state'], ["kerala", "Lemuria"]), 'state'].tolist() == ["Kerala", "Lemuria"]
+    assert not states.isin(df['state_id'], df['state'], []).any()
@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+import numpy as np
+from utils.similarity import SimilarityIndex, kmeans, pairwise_distances
+
+def _tensor(values):
+    """Stand-in for MetricTensor with one component dataset."""
+    n_states, n_years, n_components = values.shape
+    return SimpleNamespace(
+        values=values,
+        states=np.array([f"State {i}" for i in range(n_states)], dtype=object),
+        years=np.arange(2013, 2013 + n_years),
+        metric_datasets=np.array(["mix"] * n_components, dtype=object),
+        metric_components=np.array([f"C{c}" for c in range(n_components)], dtype=object),
+    )
+
+def _values(seed=0, n_states=12, n_years=3, n_components=4):
+    return np.random.default_rng(seed).gamma(1.0, size=(n_states, n_years, n_components))
+
+def test_peers_match_brute_force():
+    values = _values()
+    values[3, 1] = np.nan
+    for metric in ("euclidean", "cosine", "hellinger"):
+        index = SimilarityIndex(_tensor(values), "mix", metric)
+        distances = pairwise_distances(index.vectors[1], metric=metric)
+        has_data = np.flatnonzero(index.has_data[1])
+        peer_ids, peer_distances = index.peers(0, 2014, 5)
+        expected = sorted((d, i) for i, d in enumerate(distances[0]) if i != 0 and i in has_data)[:5]
+        assert peer_ids.tolist() == [i for _, i in expected]
+        np.testing.assert_allclose(peer_distances, [d for d, _ in expected], atol=1e-9)
+        assert not index.peers(3, 2014, 5)[0].size
+
+def test_cosine_clusters_use_unit_vectors():
+    values = _values(n_states=20, n_years=1)
+    index = SimilarityIndex(_tensor(values), "mix", "cosine")
+    _, labels, _ = index.clusters(2013, 3)
+    vectors = index.vectors[0]
+    unit = vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+    assert labels.tolist() == kmeans(unit, 3)[0].tolist()
+    assert labels.tolist() != kmeans(vectors, 3)[0].tolist()
+
+def test_clusters_for_a_year_without_data_are_empty():
+    values = _values()
+    values[:, 2] = np.nan
+    index = SimilarityIndex(_tensor(values), "mix")
+    state_ids, labels, projection = index.clusters(2015, 4)
+    assert state_ids.size == 0 and labels.size == 0 and projection.shape == (0, 2)
+    assert not index.peers(0, 2015, 5)[0].size
@@ -0,0 +1,64 @@
+import os
+import sqlite3
+import tempfile
+import time
+import pytest
+from utils import sql_engine
+from utils.sql_engine import EXAMPLE_QUERIES, MAX_ROWS, run_query
+
+@pytest.mark.parametrize("sql", [
+    "DROP TABLE states",
+    "DELETE FROM states",
+    "INSERT INTO states VALUES (99, 'Nowhere', 'NW')",
+    "UPDATE states SET state = 'Nowhere'",
+    "CREATE TABLE scratch (x INTEGER)",
+    "PRAGMA query_only = OFF",
+    "PRAGMA table_info(states)",
+    "BEGIN",
+])
+def test_non_read_statements_are_refused(sql):
+    with pytest.raises(sqlite3.Error):
+        run_query(sql)
+    result, _, _, _ = run_query("SELECT COUNT(*) AS n FROM states")
+    assert result["n"][0] == 28
+
+def test_attach_is_refused_and_creates_no_file():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "attached.db")
+        with pytest.raises(sqlite3.Error):
+            run_query(f"ATTACH DATABASE '{path}' AS other")
+        assert not os.path.exists(path)
+
+def test_statements_without_rows_are_refused():
+    with pytest.raises(sqlite3.Error):
+        run_query("-- just a comment")
+
+@pytest.mark.parametrize("name", list(EXAMPLE_QUERIES))
+def test_example_queries_run(name):
+    result, _, _, _ = run_query(EXAMPLE_QUERIES[name])
+    assert len(result) > 0
+
+def test_recursive_cte_is_allowed():
+    result, _, _, _ = run_query("WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 3) SELECT i FROM n")
+    assert result["i"].tolist() == [1, 2, 3]
+
+def test_runaway_recursive_query_is_stopped(monkeypatch):
+    monkeypatch.setattr(sql_engine, "QUERY_TIMEOUT_S", 0.2)
+    start = time.perf_counter()
+    with pytest.raises(sqlite3.OperationalError, match="stopped"):
+        run_query("WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) SELECT COUNT(*) FROM n")
+    assert time.perf_counter() - start < 5
+    # The connection is usable again afterwards
+    result, _, _, _ = run_query("SELECT COUNT(*) AS n FROM states")
+    assert result["n"][0] == 28
+
+def test_results_are_capped_at_max_rows():
+    result, truncated, _, _ = run_query("WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) SELECT i FROM n")
+    assert truncated and len(result) == MAX_ROWS
+
+    result, truncated, _, _ = run_query(f"WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < {MAX_ROWS}) SELECT i FROM n")
+    assert not truncated and len(result) == MAX_ROWS
+
+def test_repeated_column_names_are_made_unique():
+    result, _, _, _ = run_query("SELECT a.state, b.state, a.state FROM states a JOIN states b ON b.state_id = a.state_id LIMIT 1")
+    assert result.columns.tolist() == ["state", "state.1", "state.2"]
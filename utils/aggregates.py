@@ -0,0 +1,152 @@
+"""
+Aligned state × year × metric tensor built once from every dataset.
+
+A metric is a (dataset, component) pair, plus the published total of each
+component dataset. Gaps are NaN, so cross-metric views are plain array
+slicing instead of per-interaction merges on string keys. Anomaly scores
+for every point (see utils.anomalies) are computed alongside the values.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.anomalies import score_anomalies
+from utils.constants import datasets, indian_states
+from utils.disk_cache import disk_cache
+from utils.data_loader import dataset_version, load_all_tidy_datasets, load_component_totals, load_state_revenue_totals
+from utils.entities import components
+
+TOTAL_LABEL = "Total"
+
+class MetricTensor:
+    """Dense (state, year, metric) array with labelled axes."""
+
+    def __init__(self, values, years, metric_datasets, metric_components):
+        # Shared across sessions, so guard against accidental in-place edits
+        self.values = values
+        self.values.flags.writeable = False
+        self.states = np.array(indian_states, dtype=object)
+        self.years = np.asarray(years)
+        self.metric_datasets = np.asarray(metric_datasets, dtype=object)
+        self.metric_components = np.asarray(metric_components, dtype=object)
+        self.metric_labels = [
+            f"{datasets[name][0]}: {component}"
+            for name, component in zip(self.metric_datasets, self.metric_components)
+        ]
+        self._metric_index = {label: i for i, label in enumerate(self.metric_labels)}
+
+        # Index of each metric's dataset total (-1 where the dataset has none)
+        total_positions = {
+            name: i for i, (name, component) in enumerate(zip(self.metric_datasets, self.metric_components))
+            if component == TOTAL_LABEL
+        }
+        self.total_of = np.array([total_positions.get(name, -1) for name in self.metric_datasets])
+
+        # Anomaly scores and flags for every point, computed once with the tensor
+        self.level_scores, self.change_scores, self.anomaly_flags = score_anomalies(values)
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def metric_index(self, label):
+        return self._metric_index[label]
+
+    def year_index(self, year):
+        return int(np.searchsorted(self.years, year))
+
+    def metrics_for(self, dataset):
+        """Metric labels belonging to one dataset."""
+        return [label for label, name in zip(self.metric_labels, self.metric_datasets) if name == dataset]
+
+    def metric(self, label):
+        """(state, year) matrix for one metric."""
+        return self.values[:, :, self._metric_index[label]]
+
+    def year_slice(self, year):
+        """(state, metric) matrix for one year."""
+        return self.values[:, self.year_index(year), :]
+
+    def cell(self, label, year):
+        """Per-state vector for one metric and year."""
+        return self.values[:, self.year_index(year), self._metric_index[label]]
+
+    def anomalies(self, dataset=None):
+        """Tidy frame of flagged points, optionally for one dataset."""
+        flags = self.anomaly_flags
+        if dataset is not None:
+            flags = flags & (self.metric_datasets == dataset)
+        s, y, m = np.nonzero(flags)
+        return pd.DataFrame({
+            'state': self.states[s],
+            'state_id': s,
+            'metric': np.array(self.metric_labels, dtype=object)[m],
+            'component': self.metric_components[m],
+            'year': self.years[y],
+            'value': self.values[s, y, m],
+            'level_score': self.level_scores[s, y, m].round(1),
+            'change_score': self.change_scores[s, y, m].round(1),
+        })
+
+    def shares(self):
+        """Each metric as a percentage of its dataset total (NaN where there is no total)."""
+        totals = np.where(self.total_of >= 0, self.total_of, 0)
+        denominators = np.where(self.total_of >= 0, self.values[:, :, totals], np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(denominators > 0, self.values / denominators * 100, np.nan)
+
+def _scatter(values, tidy, year_pos, metric_of_component):
+    metric_idx = metric_of_component[tidy['component_id'].to_numpy()]
+    keep = metric_idx >= 0
+    values[
+        tidy['state_id'].to_numpy()[keep],
+        year_pos[keep],
+        metric_idx[keep],
+    ] = tidy['value'].to_numpy()[keep]
+
+@st.cache_resource
+@disk_cache(version=dataset_version)
+def build_metric_tensor():
+    """Build the tensor from all six datasets (cached and shared across sessions)."""
+    tidy = load_all_tidy_datasets()
+    totals = {
+        name: load_component_totals(datasets[name][1])
+        for name in ("capex_components", "revex_components", "public_liability_debt")
+    }
+    totals["revenue_components"] = (
+        load_state_revenue_totals(datasets["revenue_components"][1])
+        .rename(columns={'State': 'state', 'Total': 'total'})
+        .assign(year=lambda df: df['Year'].str[:4].astype(int))
+    )
+    years = np.unique(np.concatenate([df['year'].to_numpy() for df in tidy.values()]))
+
+    # Metric axis: each dataset's components in dictionary order, then its published total
+    metric_datasets, metric_components, offsets = [], [], {}
+    for name, df in tidy.items():
+        component_ids = np.unique(df['component_id'].to_numpy())
+        component_ids = component_ids[component_ids >= 0]
+        offsets[name] = (len(metric_datasets), component_ids)
+        metric_datasets.extend([name] * len(component_ids))
+        metric_components.extend(components.names[component_ids])
+        if name in totals:
+            metric_datasets.append(name)
+            metric_components.append(TOTAL_LABEL)
+
+    values = np.full((len(indian_states), len(years), len(metric_datasets)), np.nan)
+
+    for name, df in tidy.items():
+        start, component_ids = offsets[name]
+        metric_of_component = np.full(len(components), -1)
+        metric_of_component[component_ids] = start + np.arange(len(component_ids))
+        year_pos = np.searchsorted(years, df['year'].to_numpy())
+        _scatter(values, df, year_pos, metric_of_component)
+
+        if name in totals:
+            total = totals[name]
+            total = total[total['state_id'] >= 0]
+            values[
+                total['state_id'].to_numpy(),
+                np.searchsorted(years, total['year'].to_numpy()),
+                start + len(component_ids),
+            ] = total['total'].to_numpy()
+
+    return MetricTensor(values, years, metric_datasets, metric_components)
@@ -0,0 +1,293 @@
+"""
+Client-side year playback for the state comparison bar charts and the map.
+
+Every year frame is built at once from a precomputed (state, year[, component])
+array and shipped inside a single Plotly figure. The base traces hold
+everything that stays the same across years: state labels, colours, text,
+hover templates. Each frame carries only the x values, or z for the map.
+Traces whose values are identical in every year are left out of the frames.
+Frames are applied on top of the current figure, so any frame can be jumped
+to directly. The play button and the year slider then run in the browser
+with no Streamlit rerun.
+
+Map geometry is cached once per detail level and attached to the cached
+per-metric figure when it is shown. Stepping through years never re-sends
+it, but a rerun that changes the figure (another metric, value/share or
+detail level) sends the whole figure again, geometry included.
+"""
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+from utils.aggregates import TOTAL_LABEL, build_metric_tensor
+from utils.constants import state_colors, state_to_initial
+from utils.data_loader import dataset_version
+from utils.disk_cache import disk_cache
+from utils.geometry import boundaries_version, build_boundaries
+from utils.ranking import build_ranking_engine
+
+FRAME_DURATION = 700
+TRANSITION_DURATION = 400
+
+def _x_values(values):
+    """Rounded values with gaps as None, ready for JSON."""
+    values = np.round(values, 2).astype(object)
+    values[np.isnan(values.astype(float))] = None
+    return values.tolist()
+
+def _finite_range(values):
+    """(min, max) of the non-NaN values, or None if there are none."""
+    finite = values[np.isfinite(values)]
+    return (float(finite.min()), float(finite.max())) if finite.size else None
+
+def _year_position(years, year):
+    return min(int(np.searchsorted(years, year)), len(years) - 1)
+
+def year_frames(values, years, format_year=str, trace=go.Bar, attribute="x"):
+    """
+    One frame per year from a (trace, category, year) array.
+
+    Frames carry only `attribute`, and only for traces that change at some point.
+    """
+    flat = np.nan_to_num(values, nan=np.inf)
+    changing = np.flatnonzero(~(flat == flat[:, :, :1]).all(axis=(1, 2)))
+    return [
+        go.Frame(
+            name=format_year(year),
+            data=[trace(**{attribute: _x_values(values[t, :, y])}) for t in changing],
+            traces=changing.tolist()
+        )
+        for y, year in enumerate(years)
+    ]
+
+def add_playback_controls(fig, years, active_year, format_year=str, redraw=False):
+    """
+    Attach play/pause buttons and a year slider that step through the frames.
+
+    Traces without animated transitions (e.g. choropleths) need redraw=True.
+    """
+    animate_args = dict(
+        mode="immediate",
+        frame=dict(duration=FRAME_DURATION, redraw=redraw),
+        transition=dict(duration=TRANSITION_DURATION, easing="cubic-in-out")
+    )
+    fig.update_layout(
+        updatemenus=[dict(
+            type="buttons",
+            direction="left",
+            x=0, y=-0.08, xanchor="left", yanchor="top",
+            pad=dict(t=10, r=10),
+            showactive=False,
+            buttons=[
+                dict(label="▶ Play", method="animate", args=[None, dict(animate_args, fromcurrent=True)]),
+                dict(label="⏸ Pause", method="animate", args=[[None], dict(animate_args, frame=dict(duration=0, redraw=False))]),
+            ]
+        )],
+        sliders=[dict(
+            active=_year_position(years, active_year),
+            x=0.15, y=-0.08, len=0.85, xanchor="left", yanchor="top",
+            pad=dict(t=10),
+            currentvalue=dict(prefix="Year: ", font=dict(size=16)),
+            transition=dict(duration=TRANSITION_DURATION),
+            steps=[
+                dict(
+                    label=format_year(year),
+                    method="animate",
+                    args=[[format_year(year)], animate_args]
+                )
+                for year in years
+            ]
+        )]
+    )
+    return fig
+
+def create_animated_bar_chart(values, states, years, active_year, title, x_label, format_year=str):
+    """Horizontal one-bar-per-state chart over a (state, year) array, in the given state order."""
+    y = _year_position(years, active_year)
+    fig = go.Figure(
+        data=[go.Bar(
+            x=_x_values(values[:, y]),
+            y=list(states),
+            orientation='h',
+            text=[state_to_initial[s] for s in states],
+            textposition="outside",
+            textfont_size=12,
+            marker_color=[state_colors[s] for s in states],
+            hovertemplate="<b>%{y}</b><br>Value: ₹%{x:,.0f} Cr<extra></extra>"
+        )],
+        frames=year_frames(values[None], years, format_year)
+    )
+    value_range = _finite_range(values)
+    fig.update_layout(
+        yaxis=dict(autorange="reversed", categoryorder="array", categoryarray=list(states)),
+        xaxis=dict(
+            separatethousands=True, tickprefix="₹", title_text=x_label,
+            range=[0, value_range[1] * 1.1] if value_range else None
+        ),
+        showlegend=False,
+        template="plotly_white",
+        height=750,
+        margin=dict(l=150, r=50, t=50, b=120),
+        font=dict(family="Arial", size=14),
+        title_text=title,
+        title_font=dict(size=20, family="Arial")
+    )
+    return add_playback_controls(fig, years, active_year, format_year)
+
+def create_animated_stacked_chart(values, states, components, years, component_colors, active_year, title, is_percentage, format_year=str):
+    """Horizontal stacked composition chart over a (state, year, component) array."""
+    y = _year_position(years, active_year)
+    hover = "Share: %{x:.1f}%" if is_percentage else "Value: ₹%{x:,.0f} Cr"
+    fig = go.Figure(
+        data=[
+            go.Bar(
+                x=_x_values(values[:, y, c]),
+                y=list(states),
+                orientation='h',
+                name=component,
+                marker_color=component_colors[component],
+                hovertemplate=f"<b>{component}</b><br>%{{y}}<br>{hover}<extra></extra>"
+            )
+            for c, component in enumerate(components)
+        ],
+        frames=year_frames(values.transpose(2, 0, 1), years, format_year)
+    )
+    if is_percentage:
+        x_range = [0, 100]
+    else:
+        value_range = _finite_range(np.nansum(values, axis=2))
+        x_range = [0, value_range[1] * 1.05] if value_range else None
+    fig.update_layout(
+        barmode='stack',
+        title=title,
+        height=max(450, len(states) * 35) + 80,
+        xaxis=dict(range=x_range, title_text="Percentage (%)" if is_percentage else "Value (₹ Crores)"),
+        yaxis=dict(autorange="reversed", categoryorder="array", categoryarray=list(states), title_text="State"),
+        hovermode='closest',
+        legend=dict(yanchor="top", y=0.99, xanchor="left", x=1.02),
+        margin=dict(b=120)
+    )
+    return add_playback_controls(fig, years, active_year, format_year)
+
+def create_animated_choropleth(values, state_ids, names, years, title, colorbar_title, format_year=str):
+    """
+    Choropleth of a (state, year) array over features keyed by state ID, starting at the last year.
+
+    The figure carries no geometry; attach it with
+    `fig.update_traces(geojson=...)`. Frames swap z.
+    """
+    zmin, zmax = _finite_range(values) or (None, None)
+    fig = go.Figure(
+        data=[go.Choropleth(
+            featureidkey="id",
+            locations=list(state_ids),
+            z=_x_values(values[:, -1]),
+            text=list(names),
+            zmin=zmin,
+            zmax=zmax,
+            colorscale="Viridis",
+            marker_line_color="white",
+            marker_line_width=0.5,
+            colorbar=dict(title=colorbar_title),
+            hovertemplate="<b>%{text}</b><br>%{z:,.1f}<extra></extra>"
+        )],
+        frames=year_frames(values[None], years, format_year, trace=go.Choropleth, attribute="z")
+    )
+    fig.update_geos(fitbounds="locations", visible=False, projection_type="mercator")
+    fig.update_layout(
+        title=title,
+        height=750,
+        margin=dict(l=10, r=10, t=50, b=100)
+    )
+    return add_playback_controls(fig, years, years[-1], format_year, redraw=True)
+
+def _with_data(values, state_ids):
+    """Years and states (in the given order) that have at least one value."""
+    years_mask = ~np.isnan(values).all(axis=tuple(i for i in range(values.ndim) if i != 1))
+    state_ids = [i for i in state_ids if not np.isnan(values[i]).all()]
+    return years_mask, state_ids
+
+@st.cache_data
+@disk_cache(version=dataset_version)
+def build_metric_playback(metric, active_year, title, x_label, selected_states=None):
+    """
+    Animated per-state bar chart for one metric (cached).
+
+    States are ordered smallest first by their value in active_year, with
+    states that have no value that year last. None if no selected state
+    has data.
+    """
+    tensor = build_metric_tensor()
+    values = tensor.metric(metric)
+    order = list(build_ranking_engine().sort_order(metric, active_year)[::-1])
+    order += [i for i in range(len(tensor.states)) if i not in order]
+    if selected_states is not None:
+        order = [i for i in order if tensor.states[i] in selected_states]
+    years_mask, state_ids = _with_data(values, order)
+    if not state_ids:
+        return None
+    return create_animated_bar_chart(
+        values[state_ids][:, years_mask], tensor.states[state_ids], tensor.years[years_mask],
+        active_year, title, x_label
+    )
+
+@st.cache_data
+@disk_cache(version=dataset_version)
+def build_composition_playback(dataset, active_year, title, is_percentage, component_colors, state_order=None):
+    """
+    Animated stacked composition chart for one component dataset (cached).
+
+    States follow state_order, then the rest alphabetically. None if
+    there is no data.
+    """
+    tensor = build_metric_tensor()
+    metric_idx = np.flatnonzero(
+        (tensor.metric_datasets == dataset) & (tensor.metric_components != TOTAL_LABEL)
+    )
+    source = tensor.shares() if is_percentage else tensor.values
+    values = source[:, :, metric_idx]
+
+    order = list(state_order or [])
+    order += sorted(set(tensor.states) - set(order))
+    state_ids = [int(np.flatnonzero(tensor.states == s)[0]) for s in order]
+    years_mask, state_ids = _with_data(values, state_ids)
+    if not state_ids:
+        return None
+    return create_animated_stacked_chart(
+        values[state_ids][:, years_mask], tensor.states[state_ids], tensor.metric_components[metric_idx],
+        tensor.years[years_mask], component_colors, active_year, title, is_percentage
+    )
+
+@st.cache_data
+@disk_cache(version=lambda: dataset_version() + boundaries_version())
+def build_choropleth_frames(metric, by, detail):
+    """
+    Geometry-free animated map of one metric, by value or share of the
+    dataset total (cached). None if no drawn state has data.
+    """
+    tensor = build_metric_tensor()
+    source = tensor.values if by == "value" else tensor.shares()
+    values = source[:, :, tensor.metric_index(metric)]
+
+    drawn = {feature["id"] for feature in build_boundaries(detail)["features"]}
+    years_mask, state_ids = _with_data(values, [i for i in range(len(tensor.states)) if i in drawn])
+    if not state_ids:
+        return None
+    return create_animated_choropleth(
+        values[state_ids][:, years_mask], state_ids, tensor.states[state_ids],
+        tensor.years[years_mask], metric,
+        "₹ Crores" if by == "value" else "Share (%)"
+    )
+
+def build_choropleth_playback(metric, by, detail):
+    """
+    Animated map of one metric at one detail level, or None if there is no data.
+
+    The per-metric figure and the geometry are cached separately, so the
+    boundaries are held once per detail level rather than once per metric.
+    The returned figure includes the geometry, so showing it sends the
+    geometry to the browser.
+    """
+    fig = build_choropleth_frames(metric, by, detail)
+    if fig is not None:
+        fig.update_traces(geojson=build_boundaries(detail))
+    return fig
@@ -0,0 +1,92 @@
+"""
+Robust anomaly scores for every state × year × metric point.
+
+Scores are computed in one array pass over the metric tensor:
+
+- level score: deviation from a centred rolling median along the year axis,
+  scaled by the rolling MAD (catches one-off spikes)
+- change score: a state's year-over-year % change, robust z-scored against
+  every other state's change for the same metric and year (catches breaks
+  such as the 2014 Andhra Pradesh bifurcation, when every other state grew)
+
+Scales are floored so near-constant series don't flag rounding noise. The
+level floor follows how far the neighbouring years sit from the rolling
+median, between SPIKE_FLOOR and LEVEL_FLOOR of the median, so a single
+mistyped figure in an otherwise steady series (e.g. 9,999 among ~92,000s)
+still stands out. The floor doesn't depend on the point itself, so a
+point's score grows steadily with its own deviation. A YoY break out of a
+level outlier is attributed to the outlier, not to the correct year after
+it.
+"""
+import warnings
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+WINDOW = 5
+THRESHOLD = 4.0
+MAD_TO_SIGMA = 1.4826
+LEVEL_FLOOR = 0.25     # fraction of the rolling median
+SPIKE_FLOOR = 0.15     # fraction of the rolling median, when the neighbours sit on it
+CHANGE_FLOOR = 5.0     # percentage points of YoY change
+
+def _nanmedian(values, axis, keepdims=False):
+    # All-NaN slices are expected for gappy series
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanmedian(values, axis=axis, keepdims=keepdims)
+
+def rolling_level_scores(values, window=WINDOW):
+    """Robust z of each point against a centred rolling median along axis 1."""
+    pad = window // 2
+    padded = np.pad(values, [(0, 0), (pad, pad), (0, 0)], constant_values=np.nan)
+    # (state, year, metric, window)
+    windows = sliding_window_view(padded, window, axis=1)
+    median = _nanmedian(windows, axis=-1)
+    mad = _nanmedian(np.abs(windows - median[..., None]), axis=-1)
+    # Relative deviation of the years either side, so the floor is the same
+    # wherever the point itself lies
+    neighbours = np.stack([windows[..., pad - 1], windows[..., pad + 1]], axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        neighbour_deviation = np.abs(neighbours - median[..., None]) / np.abs(median[..., None])
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        neighbour_deviation = np.nanmax(neighbour_deviation, axis=-1)
+    floor = np.clip(np.nan_to_num(neighbour_deviation, nan=LEVEL_FLOOR), SPIKE_FLOOR, LEVEL_FLOOR)
+    scale = np.maximum(MAD_TO_SIGMA * mad, floor * np.abs(median))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = np.where(scale > 0, (values - median) / scale, 0.0)
+    return np.nan_to_num(scores)
+
+def yoy_change_scores(values):
+    """Robust z of each YoY % change against all states' change for the same metric and year."""
+    previous = values[:, :-1, :]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change = np.where(previous != 0, (values[:, 1:, :] - previous) / np.abs(previous) * 100, np.nan)
+    median = _nanmedian(change, axis=0, keepdims=True)
+    mad = _nanmedian(np.abs(change - median), axis=0, keepdims=True)
+    scale = np.maximum(MAD_TO_SIGMA * np.nan_to_num(mad), CHANGE_FLOOR)
+    scores = np.nan_to_num((change - median) / scale)
+    # The first year has no previous year to compare against
+    return np.concatenate([np.zeros_like(values[:, :1, :]), scores], axis=1)
+
+def attribute_breaks(level, change, threshold=THRESHOLD):
+    """
+    Move a YoY break onto the earlier year when that year is a level outlier
+    and the later one isn't, keeping the stronger of the two change scores.
+    """
+    # move[:, t] means the change at year t + 1 belongs to year t
+    move = (np.abs(level[:, :-1, :]) > threshold) & (np.abs(level[:, 1:, :]) <= threshold)
+    earlier, later = change[:, :-1, :], change[:, 1:, :]
+    stronger = np.where(np.abs(later) > np.abs(earlier), later, earlier)
+
+    attributed = change.copy()
+    attributed[:, :-1, :] = np.where(move, stronger, earlier)
+    attributed[:, 1:, :][move] = 0.0
+    return attributed
+
+def score_anomalies(values, threshold=THRESHOLD):
+    """Return (level_scores, change_scores, flags), each shaped like `values`."""
+    level = rolling_level_scores(values)
+    change = attribute_breaks(level, yoy_change_scores(values), threshold)
+    flags = ~np.isnan(values) & ((np.abs(level) > threshold) | (np.abs(change) > threshold))
+    return level, change, flags
@@ -21,9 +21,76 @@ state_colors1 = [
     "#17becf", "#b5cf6b", "#e7ba52"
 ]
 
+# Other spellings of state names found in the source files
+state_aliases = {
+    "Arunchal Pradesh": "Arunachal Pradesh",
+    "Chattisgarh": "Chhattisgarh",
+    "Orissa": "Odisha",
+    "Tamilnadu": "Tamil Nadu",
+    "Telengana": "Telangana",
+    "Uttaranchal": "Uttarakhand",
+}
+
+# Row labels that stand for an all-states aggregate rather than a state
+aggregate_labels = ["Total", "All States", "India Total", "Grand Total"]
+
+# Canonical component names across all datasets
+components = [
+    # Revenue receipts (state_finances.csv, state_revenue_components.csv)
+    "Revenue Receipts",
+    "States' Own Tax", "Share in Union Taxes", "Grants in Aid - CSS", "Grants in Aid - Others",
+    "Non Tax Rev - Int, Div, Profit", "Non Tax Rev - Others",
+    # Expenditure (state_revex_capex.csv, states_revex_components.csv, states_capex_components.csv)
+    "REx", "CEx",
+    "Agriculture & Allied Activities", "Civil Supplies", "Ecology & Environment",
+    "Education, Sports, Art & Culture", "Energy",
+    "Grants in Aid (Compensation & Assignments to Local Bodies and PRIs)",
+    "Health & Family Welfare", "Housing & Urban Development", "Industries & Minerals",
+    "Irrigation and Flood Control", "Others", "Police", "Public Works", "Rural Development",
+    "Social Security & Welfare", "Social Welfare & Nutrition", "Tourism", "Transport",
+    "Water Supply and Sanitation", "Welfare of SCs, STs, OBCs and Minorities",
+    # Public liability and debt (states_public_liability_debt.csv)
+    "Internal Debt", "Loans and advances from the Centre", "Public Account Liability",
+]
+
+# Other spellings of component names found in the source files
+component_aliases = {
+    "Grant in aid-CSS": "Grants in Aid - CSS",
+    "Grant in aid-Others": "Grants in Aid - Others",
+    "Education, Sports, Art and Culture": "Education, Sports, Art & Culture",
+    "Industry & Minerals": "Industries & Minerals",
+    "Irrigation & Flood Control": "Irrigation and Flood Control",
+    "Social Welfare and Nutrition": "Social Welfare & Nutrition",
+    "Social Welfare and Welfare": "Social Welfare & Nutrition",
+    "Welfare of SCs/STs/OBCs/Minorities": "Welfare of SCs, STs, OBCs and Minorities",
+}
+
+# Every dataset in the dashboard: name -> (title, source file)
+datasets = {
+    "revenue_receipts": ("Revenue Receipts", "data/state_finances.csv"),
+    "revenue_components": ("Revenue Components", "data/state_revenue_components.csv"),
+    "revex_capex": ("Revenue & Capital Expenditure", "data/state_revex_capex.csv"),
+    "capex_components": ("Capital Expenditure Components", "data/states_capex_components.csv"),
+    "revex_components": ("Revenue Expenditure Components", "data/states_revex_components.csv"),
+    "public_liability_debt": ("Public Liability and Debt", "data/states_public_liability_debt.csv"),
+}
+
 # Map state -> initials
 state_to_initial = dict(zip(indian_states, indian_state_initials))
 
 # Color mapping (unique & consistent across pages)
 color_list = pc.qualitative.Alphabet + pc.qualitative.Dark24
-state_colors = {state: color_list[i % len(color_list)] for i, state in enumerate(indian_states)}
\ No newline at end of file
+state_colors = {state: color_list[i % len(color_list)] for i, state in enumerate(indian_states)}
+# Tile-grid map position (row from the top, column from the left) of each state,
+# roughly following its place on the map; used when no boundary file is bundled
+state_tiles = {
+    "Himachal Pradesh": (0, 2), "Arunachal Pradesh": (0, 8),
+    "Punjab": (1, 1), "Uttarakhand": (1, 3), "Sikkim": (1, 5), "Assam": (1, 7), "Nagaland": (1, 8),
+    "Rajasthan": (2, 1), "Haryana": (2, 2), "Uttar Pradesh": (2, 3), "Bihar": (2, 4), "West Bengal": (2, 5),
+    "Meghalaya": (2, 7), "Manipur": (2, 8),
+    "Gujarat": (3, 1), "Madhya Pradesh": (3, 2), "Chhattisgarh": (3, 3), "Jharkhand": (3, 4),
+    "Tripura": (3, 7), "Mizoram": (3, 8),
+    "Maharashtra": (4, 2), "Telangana": (4, 3), "Odisha": (4, 4),
+    "Goa": (5, 1), "Karnataka": (5, 2), "Andhra Pradesh": (5, 3),
+    "Kerala": (6, 2), "Tamil Nadu": (6, 3),
+}
@@ -1,15 +1,109 @@
+import hashlib
+import os
 import pandas as pd
 import streamlit as st
 import re
-from utils.constants import indian_states
+import threading
+from utils.constants import datasets, state_to_initial
+from utils.disk_cache import disk_cache
+from utils.entities import add_entity_ids, states, unmatched_report
+
+# Copy-on-write is the default from pandas 3.0; opt in on 2.x so filtered
+# frames never need a defensive .copy() before adding columns
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+_dataset_digests = {}
+_dataset_digests_lock = threading.Lock()
+
+def dataset_version():
+    """
+    Content hash of every dataset file; changes whenever any source data changes.
+
+    Files are only re-read when their size or mtime changes, so calling
+    this on every rerun stays cheap.
+    """
+    signature = []
+    for name, (_, path) in sorted(datasets.items()):
+        stat = os.stat(path)
+        signature.append((name, path, stat.st_mtime_ns, stat.st_size))
+    signature = tuple(signature)
+
+    with _dataset_digests_lock:
+        if signature in _dataset_digests:
+            return _dataset_digests[signature]
+
+    digest = hashlib.sha256()
+    for name, path, _, _ in signature:
+        with open(path, "rb") as f:
+            digest.update(name.encode())
+            digest.update(f.read())
+    with _dataset_digests_lock:
+        _dataset_digests[signature] = digest.hexdigest()
+    return _dataset_digests[signature]
 
 def load_state_finances(path="data/state_finances.csv"):
     df = pd.read_csv(path)
     for col in df.columns[1:]:
         df[col] = pd.to_numeric(df[col].astype(str).str.replace(",", ""), errors='coerce')
-    return df
+    return add_entity_ids(df, 'States')
 
-def load_state_revenue_components(path="data/state_revenue_components.csv"):
+def melt_state_finances(data):
+    """Reshape the state finances table to long format with integer years."""
+    data_long = data.melt(id_vars=['States', 'state_id'], var_name='Year', value_name='Value')
+    data_long['Year'] = data_long['Year'].str[:4].astype(int)
+    data_long['Initial'] = data_long['States'].map(state_to_initial)
+    return data_long
+
+@st.cache_resource
+def load_state_finances_long(path="data/state_finances.csv"):
+    """Long-format state finances, shared across sessions; treat as read-only."""
+    return melt_state_finances(load_state_finances(path))
+
+def load_state_revex_capex(path="data/state_revex_capex.csv"):
+    df = pd.read_csv(path)
+
+    # Drop rows without states
+    df = df.dropna(subset=['States'])
+
+    df = df[~df['States'].str.strip().str.lower().isin(['total', 'all states', 'india total', 'grand total'])]
+
+    # The REx/CEx header row has no state, so dropna above already removed it
+    df = df.reset_index(drop=True)
+
+    # Build proper column names (e.g., 2022-23_REx, 2022-23_CEx)
+    new_cols = ['States']
+    for i in range(1, len(df.columns), 2):
+        year = df.columns[i]
+        new_cols.extend([f"{year}_REx", f"{year}_CEx"])
+    df.columns = new_cols
+
+    # --- Clean and convert to numeric safely ---
+    for col in new_cols[1:]:
+        df[col] = (
+            df[col]
+            .astype(str)
+            .str.replace(",", "", regex=False)
+            .str.strip()
+            .replace({"-": None, "–": None, "": None})
+        )
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    # --- Reshape to long format ---
+    df_long = df.melt(id_vars="States", var_name="Year_Type", value_name="Value")
+    df_long["Year"] = df_long["Year_Type"].str.extract(r"(\d{4}-\d{2})")
+    df_long["Type"] = df_long["Year_Type"].str.extract(r"(REx|CEx)")
+    df_long = df_long.drop(columns=["Year_Type"])
+
+    # Extract numeric year for sorting
+    df_long['Year_Start'] = df_long['Year'].str[:4].astype(int)
+
+    df_long = add_entity_ids(df_long, 'States', 'Type')
+
+    # Sort df_long by Year_Start ascending
+    return df_long.sort_values(['Year_Start', 'States']).reset_index(drop=True)
+
+def _read_state_revenue_components(path):
     df = pd.read_csv(path)
 
     # Fill forward the state names (since only the "Total" row has the state name)
@@ -17,11 +111,10 @@ def load_state_revenue_components(path="data/state_revenue_components.csv"):
     df['State'] = df['State'].ffill()
 
     # Remove "(Total)" from state names
-    df['State'] = df['State'].str.replace(r"\s*\(Total\)", "", regex=True)
-
-    # Remove "Total" rows since we can compute totals ourselves later
-    df = df[~df['Components'].str.contains('Total', na=False)]
+    df['State'] = df['State'].str.replace(r"\s*\(Total\)", "", regex=True).str.strip()
+    return df
 
+def _melt_state_revenue_components(df):
     # Melt to long format
     df_long = df.melt(id_vars=['State', 'Components'], var_name='Year', value_name='Value')
 
@@ -32,62 +125,170 @@ def load_state_revenue_components(path="data/state_revenue_components.csv"):
         .str.replace(",", "")
         .astype(float)
     )
-
-    # Check the result
     return df_long
 
+def load_state_revenue_components(path="data/state_revenue_components.csv"):
+    df = _read_state_revenue_components(path)
+
+    # Totals are kept separately, see load_state_revenue_totals
+    df = df[~df['Components'].str.contains('Total', na=False)]
+
+    return add_entity_ids(_melt_state_revenue_components(df), 'State', 'Components')
+
+def load_state_revenue_totals(path="data/state_revenue_components.csv"):
+    """Published "(Total)" rows as a long State/Year/Total table."""
+    df = _read_state_revenue_components(path)
+    df = df[df['Components'].str.contains('Total', na=False)]
+    totals = _melt_state_revenue_components(df).drop(columns='Components').rename(columns={'Value': 'Total'})
+    return add_entity_ids(totals, 'State')
+
+def reconcile_totals(components, totals, keys, value_col, total_col, tolerance=0.005):
+    """
+    Compare summed components against the published totals for every key.
+
+    Sources round each figure independently, so a state-year is only flagged
+    when the gap exceeds max(1, tolerance * |total|).
+    """
+    component_sum = components.groupby(keys, observed=True)[value_col].sum().rename('component_sum')
+    published = totals.set_index(keys)[total_col].rename('published_total')
+    report = pd.concat([component_sum, published], axis=1, join='inner').reset_index()
+    report['difference'] = report['component_sum'] - report['published_total']
+    threshold = (report['published_total'].abs() * tolerance).clip(lower=1.0)
+    report['flagged'] = report['difference'].abs() > threshold
+    return report
+
+def _clean_value(value):
+    """Parse a published figure; blanks and dash placeholders are missing."""
+    value_str = str(value).strip()
+    value_str = value_str.replace(",", "").replace("₹", "").strip()
+    if value_str.strip("-–") == "" or value_str in ("nan", "None"):
+        return None
+    try:
+        return float(value_str)
+    except ValueError:
+        return None
+
 # -------------------------------
 # Data Loading and Cleaning
 # -------------------------------
-@st.cache_data
-def load_and_clean_data(file_path: str):
+@st.cache_resource
+def load_component_file(file_path: str):
+    """
+    Parse a state-grouped component file into (components, totals) long frames.
+
+    The frames are shared across sessions; treat them as read-only.
+    """
+    df_long, df_totals = _parse_component_file(file_path)
+    if len(df_long) == 0:
+        print("No data found. Please check the file format.")
+        return df_long, df_totals
+
+    # Reported here rather than while parsing so a disk cache hit still reports them
+    report = unmatched_report(df_long, 'state', 'component')
+    unmatched = report['states'] + report['components']
+    if unmatched:
+        print(f"Unmatched names in {file_path}: {unmatched}")
+
+    return df_long, df_totals
+
+@disk_cache(version=dataset_version)
+def _parse_component_file(file_path):
     df_raw = pd.read_csv(file_path, index_col=0)
     
     all_data = []
+    all_totals = []
     current_state = None
     state_pattern = re.compile(r'^([A-Za-z\s]+?)\s*(?:\(total\))?$', re.IGNORECASE)
+    year_cols = [
+        (year_col, int(year_match.group()))
+        for year_col in df_raw.columns
+        if (year_match := re.search(r'\d{4}', year_col))
+    ]
     
     for idx, row in df_raw.iterrows():
         row_name = str(idx).strip()
         match = state_pattern.match(row_name)
         
         if match:
-            potential_state = match.group(1).strip()
+            potential_state = states.resolve(match.group(1))
+            is_total_row = re.search(r'\(total\)\s*$', row_name, re.IGNORECASE) is not None
             
-            # Check if this is a known state
-            if potential_state in indian_states:
-                current_state = potential_state
+            # Known states (or any "(Total)" row, reported as unmatched if the
+            # name doesn't resolve) start a new block; the row holds the published total
+            if potential_state is not None or is_total_row:
+                current_state = potential_state or re.sub(r'\s+', ' ', match.group(1)).strip()
+                for year_col, year in year_cols:
+                    value_numeric = _clean_value(row[year_col])
+                    if value_numeric is not None:
+                        all_totals.append({
+                            'state': current_state,
+                            'year': year,
+                            'total': value_numeric
+                        })
                 continue
         
         # This is a component row
         if current_state is not None:
             component = row_name
-            for year_col in df_raw.columns:
-                value = row[year_col]
-                
-                # Clean the value
-                value_str = str(value).strip()
-                value_str = value_str.replace(",", "").replace("₹", "")
-                value_str = value_str.replace("-", "").replace("nan", "").replace("None", "")
-                
-                if value_str:
-                    try:
-                        value_numeric = float(value_str)
-                        year_match = re.search(r'\d{4}', year_col)
-                        if year_match:
-                            all_data.append({
-                                'state': current_state,
-                                'component': component,
-                                'year': int(year_match.group()),
-                                'value': value_numeric
-                            })
-                    except (ValueError, AttributeError):
-                        pass
+            for year_col, year in year_cols:
+                value_numeric = _clean_value(row[year_col])
+                if value_numeric is not None:
+                    all_data.append({
+                        'state': current_state,
+                        'component': component,
+                        'year': year,
+                        'value': value_numeric
+                    })
     
     df_long = pd.DataFrame(all_data)
+    df_totals = add_entity_ids(pd.DataFrame(all_totals, columns=['state', 'year', 'total']), 'state')
     
     if len(df_long) == 0:
-        print("No data found. Please check the file format.")
-        return pd.DataFrame()
+        return pd.DataFrame(), df_totals
     
-    return df_long
\ No newline at end of file
+    return add_entity_ids(df_long, 'state', 'component'), df_totals
+
+def load_and_clean_data(file_path: str):
+    return load_component_file(file_path)[0]
+
+def load_component_totals(file_path: str):
+    """Published per-state totals for a component file."""
+    return load_component_file(file_path)[1]
+
+
+# -------------------------------
+# Tidy Dataset Registry
+# -------------------------------
+TIDY_COLUMNS = ['state', 'state_id', 'component', 'component_id', 'year', 'value']
+
+@st.cache_resource
+@disk_cache(version=dataset_version)
+def load_tidy_dataset(name: str):
+    """
+    Load any dataset in constants.datasets as one tidy frame with columns
+    state, state_id, component, component_id, year (start year) and value.
+    Shared across sessions; treat as read-only.
+    """
+    path = datasets[name][1]
+
+    if name == "revenue_receipts":
+        df = melt_state_finances(load_state_finances(path))
+        df = df.rename(columns={'States': 'state', 'Year': 'year', 'Value': 'value'})
+        df['component'] = "Revenue Receipts"
+        df = add_entity_ids(df, 'state', 'component')
+    elif name == "revenue_components":
+        df = load_state_revenue_components(path)
+        df = df.rename(columns={'State': 'state', 'Components': 'component', 'Value': 'value'})
+        df['year'] = df['Year'].str[:4].astype(int)
+    elif name == "revex_capex":
+        df = load_state_revex_capex(path)
+        df = df.rename(columns={'States': 'state', 'Type': 'component', 'Year_Start': 'year', 'Value': 'value'})
+    else:
+        df = load_and_clean_data(path)
+
+    df = df[df['state_id'] >= 0]
+    return df.dropna(subset=['value'])[TIDY_COLUMNS].reset_index(drop=True)
+
+def load_all_tidy_datasets():
+    """Tidy frames for every dataset, keyed by dataset name."""
+    return {name: load_tidy_dataset(name) for name in datasets}
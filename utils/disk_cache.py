@@ -0,0 +1,223 @@
+"""
+Persistent on-disk cache that survives server restarts.
+
+`@st.cache_data` lives in process memory, so every restart re-parses the
+data files and rebuilds every aggregate and figure. Functions decorated with
+`disk_cache` also store their results under `.cache/`, keyed by:
+
+- the function (module and name)
+- the source of every module under utils/ plus the function's own file, so
+  a deploy that changes any helper, class or constant it depends on never
+  serves an entry built by the old code
+- its arguments
+- an optional data version, e.g. the dataset content hash
+- CACHE_VERSION, the entry format
+
+Each entry is a SHA-256 checksum line followed by the payload. Plotly
+figures are stored as figure JSON and everything else is pickled. An entry
+whose checksum doesn't match is deleted and recomputed. Reads refresh an
+entry's mtime, and the least recently used entries are evicted once the
+directory exceeds MAX_CACHE_BYTES.
+
+Stack it under `@st.cache_data` so in-process hits stay in memory:
+
+    @st.cache_data
+    @disk_cache(version=dataset_version)
+    def build_something(...):
+        ...
+
+Run `python -m utils.disk_cache` to print the cache size; `--clear` empties it.
+"""
+import argparse
+import functools
+import glob
+import hashlib
+import inspect
+import os
+import pickle
+import tempfile
+import threading
+import plotly.graph_objects as go
+import plotly.io as pio
+
+CACHE_DIR = ".cache"
+MAX_CACHE_BYTES = 512 * 1024 ** 2
+
+# Bump when the entry format (checksum line, serialization) changes; code
+# changes are picked up by code_version()
+CACHE_VERSION = "2"
+
+UTILS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_code_digests = {}
+_code_digests_lock = threading.Lock()
+
+def code_version(extra_files=()):
+    """
+    Content hash of every utils/*.py module plus `extra_files`.
+
+    Files are only re-read when their size or mtime changes, so the check
+    stays cheap and still notices code reloaded in a running server.
+    """
+    paths = sorted(set(glob.glob(os.path.join(UTILS_DIR, "*.py"))) | {os.path.abspath(p) for p in extra_files})
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        signature.append((path, stat.st_mtime_ns, stat.st_size))
+    signature = tuple(signature)
+
+    with _code_digests_lock:
+        if signature in _code_digests:
+            return _code_digests[signature]
+
+    digest = hashlib.sha256()
+    for path, _, _ in signature:
+        digest.update(os.path.relpath(path, UTILS_DIR).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    with _code_digests_lock:
+        _code_digests[signature] = digest.hexdigest()
+    return _code_digests[signature]
+
+def _source_file(func):
+    try:
+        path = inspect.getsourcefile(func)
+    except TypeError:
+        path = None
+    return [path] if path else []
+
+def _entry_path(func, key):
+    return os.path.join(CACHE_DIR, f"{func.__module__}.{func.__qualname__}.{key}.pkl")
+
+def _serialize(value):
+    if isinstance(value, go.Figure):
+        return pickle.dumps(("figure", value.to_json()))
+    return pickle.dumps(("pickle", value), protocol=pickle.HIGHEST_PROTOCOL)
+
+def _deserialize(payload):
+    kind, value = pickle.loads(payload)
+    return pio.from_json(value) if kind == "figure" else value
+
+def read_entry(path):
+    """Cached value at path, or raise KeyError if missing or corrupt (corrupt entries are removed)."""
+    try:
+        with open(path, "rb") as f:
+            checksum = f.readline().strip().decode()
+            payload = f.read()
+    except OSError:
+        raise KeyError(path)
+
+    try:
+        if hashlib.sha256(payload).hexdigest() != checksum:
+            raise ValueError("checksum mismatch")
+        value = _deserialize(payload)
+    except Exception as e:
+        print(f"Discarding cache entry {path}: {e}")
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        raise KeyError(path)
+
+    # Reads count as use for LRU eviction
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return value
+
+def write_entry(path, value):
+    """Atomically write value to path, then evict down to MAX_CACHE_BYTES."""
+    payload = _serialize(value)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(hashlib.sha256(payload).hexdigest().encode() + b"\n")
+        f.write(payload)
+    os.replace(tmp_path, path)
+    evict(MAX_CACHE_BYTES)
+
+def _entries():
+    """(mtime, size, path) for every cache entry, oldest first."""
+    if not os.path.isdir(CACHE_DIR):
+        return []
+    entries = []
+    for name in os.listdir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    return sorted(entries)
+
+def evict(max_bytes):
+    """Remove least recently used entries until the cache fits in max_bytes."""
+    entries = _entries()
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total -= size
+
+def clear():
+    evict(0)
+
+def disk_cache(version=None):
+    """
+    Decorator persisting results under CACHE_DIR.
+
+    `version` is an optional zero-argument callable (e.g. dataset_version)
+    whose value is part of every key, so entries go stale when it changes.
+    Calls with unpicklable arguments skip the disk cache.
+    """
+    def decorator(func):
+        source_file = _source_file(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                arguments = pickle.dumps((args, sorted(kwargs.items())))
+            except Exception:
+                return func(*args, **kwargs)
+
+            digest = hashlib.sha256()
+            digest.update(CACHE_VERSION.encode())
+            digest.update(code_version(source_file).encode())
+            digest.update(arguments)
+            if version is not None:
+                digest.update(str(version()).encode())
+            path = _entry_path(func, digest.hexdigest())
+
+            try:
+                return read_entry(path)
+            except KeyError:
+                pass
+            value = func(*args, **kwargs)
+            try:
+                write_entry(path, value)
+            except Exception as e:
+                print(f"Could not write cache entry {path}: {e}")
+            return value
+        return wrapper
+    return decorator
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or clear the on-disk cache.")
+    parser.add_argument("--clear", action="store_true", help="remove every cache entry")
+    args = parser.parse_args(argv)
+
+    if args.clear:
+        clear()
+    entries = _entries()
+    print(f"{len(entries)} entries, {sum(size for _, size, _ in entries) / 1024 ** 2:.1f} MB in {CACHE_DIR}/")
+
+if __name__ == "__main__":
+    main()
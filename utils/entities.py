@@ -0,0 +1,98 @@
+"""
+Canonical state and component dictionaries.
+
+Every state and component gets a dense integer ID at ingest so joins and
+filters across datasets work on integer arrays instead of string matching.
+Alternative spellings resolve through the alias tables in utils.constants;
+names that don't resolve get ID -1 and keep their own spelling, so each
+dataset can report them (`unmatched_report`) rather than silently drop them.
+"""
+import re
+import numpy as np
+import pandas as pd
+from utils import constants
+
+UNMATCHED_ID = -1
+
+def normalize_name(name):
+    """Casefold, drop a "(Total)" suffix and collapse whitespace."""
+    name = re.sub(r"\(\s*total\s*\)\s*$", "", str(name), flags=re.IGNORECASE)
+    return re.sub(r"\s+", " ", name).strip().casefold()
+
+class EntityDictionary:
+    """Dense integer IDs for a fixed list of canonical names."""
+
+    def __init__(self, names, aliases=None, ignore=()):
+        self.names = np.array(names, dtype=object)
+        self._lookup = {normalize_name(name): i for i, name in enumerate(names)}
+        for alias, canonical in (aliases or {}).items():
+            self._lookup[normalize_name(alias)] = self._lookup[normalize_name(canonical)]
+        self._ignore = {normalize_name(name) for name in ignore}
+
+    def __len__(self):
+        return len(self.names)
+
+    def id_of(self, name):
+        """ID for a single name, or -1 if unknown."""
+        return self._lookup.get(normalize_name(name), UNMATCHED_ID)
+
+    def resolve(self, name):
+        """Canonical spelling of a name, or None if unknown."""
+        entity_id = self.id_of(name)
+        return None if entity_id == UNMATCHED_ID else self.names[entity_id]
+
+    def unknown(self, values):
+        """Distinct names in values that neither resolve nor are ignored, sorted."""
+        names = pd.Series(values, dtype=object).dropna().astype(str).str.strip().unique()
+        return sorted(
+            name for name in names
+            if name and self.id_of(name) == UNMATCHED_ID and normalize_name(name) not in self._ignore
+        )
+
+    def encode(self, values):
+        """Vectorized name -> ID lookup; only distinct names are resolved."""
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=True)
+        unique_ids = np.array([self.id_of(name) for name in uniques], dtype=np.int32)
+        return np.where(codes >= 0, unique_ids[codes], UNMATCHED_ID).astype(np.int32)
+
+    def decode(self, ids):
+        """ID -> canonical name; -1 maps to None."""
+        ids = np.asarray(ids)
+        return np.where(ids >= 0, self.names[np.clip(ids, 0, None)], None)
+
+    def canonicalize(self, values):
+        """Return (names, ids): known names in canonical spelling, unknown ones as-is."""
+        values = np.asarray(values, dtype=object)
+        ids = self.encode(values)
+        return np.where(ids >= 0, self.decode(ids), values), ids
+
+    def isin(self, ids, names, selected):
+        """
+        Row mask for rows whose entity is in `selected`.
+
+        Known names match on ID. Unmatched names all share ID -1, so they
+        match on their own spelling instead.
+        """
+        selected = np.asarray(selected, dtype=object)
+        selected_ids = self.encode(selected)
+        mask = np.isin(ids, selected_ids[selected_ids >= 0])
+        if (selected_ids < 0).any():
+            mask |= (np.asarray(ids) < 0) & np.isin(np.asarray(names, dtype=object), selected[selected_ids < 0])
+        return mask
+
+states = EntityDictionary(constants.indian_states, constants.state_aliases, ignore=constants.aggregate_labels)
+components = EntityDictionary(constants.components, constants.component_aliases)
+
+def add_entity_ids(df, state_col, component_col=None):
+    """Canonicalize the state (and component) column in place and add *_id columns."""
+    df[state_col], df['state_id'] = states.canonicalize(df[state_col].to_numpy())
+    if component_col is not None:
+        df[component_col], df['component_id'] = components.canonicalize(df[component_col].to_numpy())
+    return df
+
+def unmatched_report(df, state_col, component_col=None):
+    """Names in one dataset's frame that are not in the canonical dictionaries."""
+    return {
+        "states": states.unknown(df.loc[df['state_id'] < 0, state_col]),
+        "components": components.unknown(df.loc[df['component_id'] < 0, component_col]) if component_col else [],
+    }
@@ -0,0 +1,137 @@
+"""
+Batched forecasts for every state × metric series.
+
+All series of the metric tensor are stacked into one (series, year) matrix
+and fitted together with NumPy array operations, so forecasting thousands of
+short series costs about as much as a single one:
+
+- "trend": least-squares linear trend on the observed years
+- "holt": Holt's linear (additive ETS) smoothing; smoothing parameters are
+  picked per series from a small grid by one-step-ahead squared error, with
+  every grid point evaluated in the same array pass
+
+Results are cached per dataset version, so they are recomputed only when a
+source file changes.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.aggregates import build_metric_tensor
+from utils.data_loader import dataset_version
+from utils.disk_cache import disk_cache
+
+METHODS = {"trend": "Linear Trend", "holt": "Holt (ETS A,A,N)"}
+ALPHAS = np.array([0.2, 0.4, 0.6, 0.8])
+BETAS = np.array([0.1, 0.3, 0.5])
+
+def fit_linear_trend(series, horizon=1):
+    """Least-squares line per row of a (series, time) matrix with NaN gaps."""
+    t = np.arange(series.shape[1], dtype=float)
+    observed = ~np.isnan(series)
+    y = np.where(observed, series, 0.0)
+    n = observed.sum(axis=1)
+    sum_t = observed @ t
+    sum_tt = observed @ (t ** 2)
+    sum_y = y.sum(axis=1)
+    sum_ty = y @ t
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = (n * sum_ty - sum_t * sum_y) / (n * sum_tt - sum_t ** 2)
+        intercept = (sum_y - slope * sum_t) / n
+        residuals = np.where(observed, series - (intercept[:, None] + slope[:, None] * t), np.nan)
+        sigma = np.sqrt(np.nansum(residuals ** 2, axis=1) / np.maximum(n - 2, 1))
+
+    future = series.shape[1] + np.arange(horizon)
+    forecast = intercept[:, None] + slope[:, None] * future
+    forecast[n < 2] = np.nan
+    return forecast, sigma
+
+def fit_holt(series, horizon=1, alphas=ALPHAS, betas=BETAS):
+    """Holt's linear smoothing for every row and every (alpha, beta) grid point at once."""
+    alpha, beta = (grid.reshape(-1, 1) for grid in np.meshgrid(alphas, betas, indexing='ij'))
+    n_series, n_years = series.shape
+
+    level = np.full((len(alpha), n_series), np.nan)
+    trend = np.zeros((len(alpha), n_series))
+    sse = np.zeros((len(alpha), n_series))
+    errors = np.zeros(n_series)
+
+    for t in range(n_years):
+        y = series[:, t]
+        observed = ~np.isnan(y)
+        started = ~np.isnan(level)
+        predicted = level + trend
+
+        # One-step-ahead error where both a prediction and an observation exist
+        step_error = np.where(started & observed, y - predicted, 0.0)
+        sse += step_error ** 2
+        errors += (started & observed).any(axis=0)
+
+        new_level = alpha * y + (1 - alpha) * predicted
+        new_trend = beta * (new_level - level) + (1 - beta) * trend
+        update = started & observed
+        first = ~started & observed
+        level = np.where(update, new_level, np.where(first, y, np.where(started, predicted, level)))
+        trend = np.where(update, new_trend, trend)
+
+    best = np.argmin(sse, axis=0)
+    columns = np.arange(n_series)
+    level, trend = level[best, columns], trend[best, columns]
+    sigma = np.sqrt(sse[best, columns] / np.maximum(errors - 1, 1))
+
+    forecast = level[:, None] + trend[:, None] * np.arange(1, horizon + 1)
+    forecast[(~np.isnan(series)).sum(axis=1) < 2] = np.nan
+    return forecast, sigma
+
+FITTERS = {"trend": fit_linear_trend, "holt": fit_holt}
+
+class Forecasts:
+    """Forecast tensor aligned with the metric tensor: (state, future year, metric)."""
+
+    def __init__(self, tensor, values, sigma, years, method):
+        self.tensor = tensor
+        self.values = values
+        self.sigma = sigma
+        self.years = years
+        self.method = method
+
+    def metric(self, label):
+        """(state, future year) forecasts for one metric."""
+        return self.values[:, :, self.tensor.metric_index(label)]
+
+    def frame(self, dataset):
+        """Tidy frame of one dataset's forecasts (components and total)."""
+        metric_idx = np.flatnonzero(self.tensor.metric_datasets == dataset)
+        state_idx, year_idx, m = np.meshgrid(
+            np.arange(len(self.tensor.states)), np.arange(len(self.years)), metric_idx, indexing='ij'
+        )
+        df = pd.DataFrame({
+            'state': self.tensor.states[state_idx.ravel()],
+            'state_id': state_idx.ravel(),
+            'component': self.tensor.metric_components[m.ravel()],
+            'year': self.years[year_idx.ravel()],
+            'value': self.values[state_idx, year_idx, m].ravel(),
+        })
+        return df.dropna(subset=['value']).reset_index(drop=True)
+
+@st.cache_resource
+@disk_cache()
+def _build_forecasts(version, method, horizon):
+    tensor = build_metric_tensor()
+    n_states, n_years, n_metrics = tensor.shape
+
+    # Every (state, metric) pair becomes one row of a (series, year) matrix
+    series = tensor.values.transpose(0, 2, 1).reshape(-1, n_years)
+    forecast, sigma = FITTERS[method](series, horizon)
+
+    # Series that were never negative shouldn't be forecast below zero
+    never_negative = ~(np.nan_to_num(series, nan=0.0) < 0).any(axis=1)
+    forecast = np.where(never_negative[:, None], np.maximum(forecast, 0), forecast)
+
+    values = forecast.reshape(n_states, n_metrics, horizon).transpose(0, 2, 1)
+    years = tensor.years[-1] + np.arange(1, horizon + 1)
+    return Forecasts(tensor, values, sigma.reshape(n_states, n_metrics), years, method)
+
+def build_forecasts(method="holt", horizon=1):
+    """Forecasts for every series, cached until any dataset file changes."""
+    return _build_forecasts(dataset_version(), method, horizon)
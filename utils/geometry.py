@@ -0,0 +1,184 @@
+"""
+State boundary geometries for the choropleth map.
+
+Boundaries are read once from the GeoJSON file bundled at BOUNDARIES_PATH
+(the 28 states, ~7,900 vertices; see the README for its source). Features
+are matched to state IDs through the entity dictionary, so a replacement
+file with any common naming property (ST_NM, NAME_1, ...) and spelling
+works. Without the file, a tile grid built from constants.state_tiles
+stands in.
+
+Each detail level in TOLERANCES is simplified once with Douglas-Peucker and
+its coordinates are rounded. The result is cached in memory and on disk.
+For the bundled file, Fine keeps nearly every vertex, Medium about two
+thirds and Coarse about a fifth. A higher-resolution replacement file is
+cut down much further.
+"""
+import hashlib
+import json
+import os
+import numpy as np
+import streamlit as st
+from utils.constants import state_tiles
+from utils.disk_cache import disk_cache
+from utils.entities import states
+
+BOUNDARIES_PATH = "data/india_states.geojson"
+NAME_PROPERTIES = ["ST_NM", "st_nm", "NAME_1", "name", "NAME", "state", "State"]
+
+# Douglas-Peucker tolerance in degrees (~0.01 degrees is ~1 km)
+TOLERANCES = {"Fine": 0.005, "Medium": 0.02, "Coarse": 0.08}
+COORDINATE_DECIMALS = 3
+
+# Tile grid layout, in degrees, placed roughly over India
+TILE_ORIGIN = (68.0, 35.0)
+TILE_STEP = 3.0
+TILE_SIZE = 2.7
+
+def douglas_peucker(points, tolerance):
+    """
+    Boolean keep-mask for an (n, 2) polyline under Douglas-Peucker.
+
+    Works through a stack of segments. Each segment's distances are computed
+    for all of its interior points at once. A closed ring (first point equal
+    to the last) is handled by measuring distance to that point.
+    """
+    n = len(points)
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, n - 1]] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        interior = points[start + 1:end]
+        a, b = points[start], points[end]
+        ab = b - a
+        length = np.hypot(*ab)
+        if length == 0:
+            distances = np.hypot(*(interior - a).T)
+        else:
+            distances = np.abs(ab[0] * (interior[:, 1] - a[1]) - ab[1] * (interior[:, 0] - a[0])) / length
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            split = start + 1 + farthest
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return keep
+
+def simplify_ring(ring, tolerance):
+    """Simplified, rounded closed ring, or None if it collapses below a triangle."""
+    points = np.asarray(ring, dtype=float)[:, :2]
+    if tolerance > 0 and len(points) > 4:
+        points = points[douglas_peucker(points, tolerance)]
+    points = np.round(points, COORDINATE_DECIMALS)
+    # Rounding can create repeated consecutive points
+    points = points[np.r_[True, (np.diff(points, axis=0) != 0).any(axis=1)]]
+    if len(points) < 4:
+        return None
+    return points.tolist()
+
+def simplify_geometry(geometry, tolerance):
+    """Simplify a Polygon or MultiPolygon, dropping rings that collapse (keeps at least one polygon)."""
+    polygons = geometry["coordinates"] if geometry["type"] == "MultiPolygon" else [geometry["coordinates"]]
+    simplified = []
+    for polygon in polygons:
+        exterior = simplify_ring(polygon[0], tolerance)
+        if exterior is None:
+            continue
+        holes = [ring for ring in (simplify_ring(r, tolerance) for r in polygon[1:]) if ring is not None]
+        simplified.append([exterior] + holes)
+    if not simplified:
+        # Keep the largest polygon unsimplified rather than losing the state
+        largest = max(polygons, key=lambda p: len(p[0]))
+        simplified = [[np.round(np.asarray(largest[0], dtype=float)[:, :2], COORDINATE_DECIMALS).tolist()]]
+    return {"type": "MultiPolygon", "coordinates": simplified}
+
+def _feature_state_id(feature):
+    properties = feature.get("properties") or {}
+    for key in NAME_PROPERTIES:
+        if key in properties:
+            state_id = states.id_of(properties[key])
+            if state_id >= 0:
+                return state_id
+    return -1
+
+def _tile_features():
+    features = []
+    for state, (row, col) in state_tiles.items():
+        x = TILE_ORIGIN[0] + col * TILE_STEP
+        y = TILE_ORIGIN[1] - row * TILE_STEP
+        ring = [[x, y], [x + TILE_SIZE, y], [x + TILE_SIZE, y - TILE_SIZE], [x, y - TILE_SIZE], [x, y]]
+        features.append({
+            "type": "Feature",
+            "id": states.id_of(state),
+            "properties": {"name": state},
+            "geometry": {"type": "Polygon", "coordinates": [ring]},
+        })
+    return features
+
+def boundaries_available():
+    """Whether a real boundary file is bundled (otherwise the tile grid is used)."""
+    return os.path.exists(BOUNDARIES_PATH)
+
+def boundaries_version():
+    """Content hash of the boundary file, or a fixed label for the tile grid."""
+    if not boundaries_available():
+        return "tiles"
+    with open(BOUNDARIES_PATH, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def load_boundaries(path=BOUNDARIES_PATH):
+    """
+    Features keyed by state ID ("id"), one MultiPolygon per state.
+
+    Features whose name doesn't resolve to a known state (UTs, disputed
+    areas) are left out and printed.
+    """
+    if not os.path.exists(path):
+        return _tile_features()
+
+    with open(path) as f:
+        collection = json.load(f)
+
+    polygons, names, unmatched = {}, {}, []
+    for feature in collection["features"]:
+        geometry = feature.get("geometry")
+        if not geometry or geometry["type"] not in ("Polygon", "MultiPolygon"):
+            continue
+        state_id = _feature_state_id(feature)
+        if state_id < 0:
+            unmatched.append(str(feature.get("properties")))
+            continue
+        parts = geometry["coordinates"] if geometry["type"] == "MultiPolygon" else [geometry["coordinates"]]
+        polygons.setdefault(state_id, []).extend(parts)
+        names[state_id] = states.names[state_id]
+    if unmatched:
+        print(f"Boundary features without a known state in {path}: {len(unmatched)}")
+
+    return [
+        {
+            "type": "Feature",
+            "id": state_id,
+            "properties": {"name": names[state_id]},
+            "geometry": {"type": "MultiPolygon", "coordinates": parts},
+        }
+        for state_id, parts in sorted(polygons.items())
+    ]
+
+def simplify_boundaries(features, tolerance):
+    """FeatureCollection with every geometry simplified at one tolerance."""
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            dict(feature, geometry=simplify_geometry(feature["geometry"], tolerance))
+            for feature in features
+        ],
+    }
+
+@st.cache_resource
+@disk_cache(version=boundaries_version)
+def build_boundaries(detail):
+    """Simplified state boundaries for one TOLERANCES level (cached and shared across sessions)."""
+    return simplify_boundaries(load_boundaries(), TOLERANCES[detail])
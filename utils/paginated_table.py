@@ -0,0 +1,107 @@
+"""
+Server-side paginated table.
+
+A TableIndex keeps one presorted row order per sort key, computed once per
+frame. Each rerun only applies the active filters to that order (one
+vectorized pass, memoized per filter set) and slices out the visible page,
+so only page_size rows are ever sent to the browser.
+"""
+import threading
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+PAGE_SIZES = [25, 50, 100, 250]
+MAX_MEMOIZED_FILTERS = 32
+
+class TableIndex:
+    """Presorted row orders and factorized filter columns for one frame."""
+
+    def __init__(self, df, sort_keys, filter_columns=()):
+        self.df = df.reset_index(drop=True)
+        self.sort_keys = dict(sort_keys)
+
+        # np.lexsort sorts by the last key first; factorize so strings sort as ints
+        self.orders = {
+            label: np.lexsort([pd.factorize(self.df[col], sort=True)[0] for col in reversed(columns)])
+            for label, columns in self.sort_keys.items()
+        }
+        self.codes = {}
+        self.uniques = {}
+        for col in filter_columns:
+            self.codes[col], self.uniques[col] = pd.factorize(self.df[col], sort=True)
+        self._filtered = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.df)
+
+    def filter_mask(self, filters):
+        """Boolean row mask for {column: allowed values}; None means no filtering."""
+        if not filters:
+            return None
+        mask = np.ones(len(self.df), dtype=bool)
+        for col, allowed in filters.items():
+            allowed_codes = np.zeros(len(self.uniques[col]) + 1, dtype=bool)
+            allowed_codes[:-1] = np.isin(self.uniques[col], list(allowed))
+            # factorize marks missing values with -1, which picks the trailing False
+            mask &= allowed_codes[self.codes[col]]
+        return mask
+
+    def ordered_rows(self, sort_label, descending=False, filters=None):
+        """Row positions in display order after filtering (memoized per filter set)."""
+        key = (sort_label, descending, tuple(sorted((col, tuple(sorted(map(str, v)))) for col, v in (filters or {}).items())))
+        with self._lock:
+            if key in self._filtered:
+                return self._filtered[key]
+
+        order = self.orders[sort_label]
+        if descending:
+            order = order[::-1]
+        mask = self.filter_mask(filters)
+        if mask is not None:
+            order = order[mask[order]]
+
+        with self._lock:
+            if len(self._filtered) >= MAX_MEMOIZED_FILTERS:
+                self._filtered.pop(next(iter(self._filtered)))
+            self._filtered[key] = order
+        return order
+
+    def page(self, sort_label, descending=False, filters=None, page=0, page_size=PAGE_SIZES[0]):
+        """(visible rows, total matching rows) for one page."""
+        order = self.ordered_rows(sort_label, descending, filters)
+        rows = order[page * page_size:(page + 1) * page_size]
+        return self.df.iloc[rows], len(order)
+
+@st.cache_resource
+def build_table_index(cache_key, _df, sort_keys, filter_columns=()):
+    """TableIndex shared across sessions; cache_key must change whenever the frame does."""
+    return TableIndex(_df, sort_keys, filter_columns)
+
+def paginated_table(index, key, filters=None, default_sort=None, default_descending=False):
+    """Render sort/page controls and the visible page of a TableIndex."""
+    labels = list(index.sort_keys)
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+    with col1:
+        sort_label = st.selectbox(
+            "Sort By",
+            labels,
+            index=labels.index(default_sort) if default_sort in labels else 0,
+            key=f"{key}_sort"
+        )
+    with col2:
+        descending = st.checkbox("Descending", value=default_descending, key=f"{key}_desc")
+    with col3:
+        page_size = st.selectbox("Rows per Page", PAGE_SIZES, key=f"{key}_page_size")
+
+    total = len(index.ordered_rows(sort_label, descending, filters))
+    n_pages = max(1, -(-total // page_size))
+    with col4:
+        page = st.number_input("Page", min_value=1, max_value=n_pages, value=1, key=f"{key}_page") - 1
+    page = min(page, n_pages - 1)
+
+    rows, total = index.page(sort_label, descending, filters, page, page_size)
+    st.dataframe(rows, hide_index=True, use_container_width=True)
+    first = page * page_size + 1 if total else 0
+    st.caption(f"Rows {first:,}–{page * page_size + len(rows):,} of {total:,} (page {page + 1} of {n_pages})")
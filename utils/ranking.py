@@ -0,0 +1,64 @@
+"""
+Precomputed state rankings for every metric and year.
+
+Ranks are computed once at load time with a single argsort over the state
+axis of the metric tensor, both by raw value and by share of the dataset
+total. Sort orders, top-k/bottom-k leaderboards and rank histories are then
+lookups rather than per-interaction frame sorts.
+"""
+import numpy as np
+import streamlit as st
+from utils.aggregates import build_metric_tensor
+from utils.data_loader import dataset_version
+from utils.disk_cache import disk_cache
+
+def _order_and_rank(values):
+    """Descending state order and 1-based ranks along axis 0; missing values rank 0."""
+    # argsort puts NaN last; negating gives descending order with stable ties
+    order = np.argsort(-values, axis=0, kind='stable')
+    ranks = np.empty_like(order)
+    positions = np.broadcast_to(
+        np.arange(1, values.shape[0] + 1).reshape(-1, *([1] * (values.ndim - 1))), order.shape
+    )
+    np.put_along_axis(ranks, order, positions, axis=0)
+    ranks[np.isnan(values)] = 0
+    return order, ranks
+
+class RankingEngine:
+    """State orders and ranks for every (year, metric), by value and by share."""
+
+    def __init__(self, tensor):
+        self.tensor = tensor
+        self.shares = tensor.shares()
+        self.order = {}
+        self.ranks = {}
+        self.order['value'], self.ranks['value'] = _order_and_rank(tensor.values)
+        self.order['share'], self.ranks['share'] = _order_and_rank(self.shares)
+
+    def _present(self, label, year, by):
+        m = self.tensor.metric_index(label)
+        y = self.tensor.year_index(year)
+        order = self.order[by][:, y, m]
+        return order[self.ranks[by][order, y, m] > 0]
+
+    def sort_order(self, label, year, by='value'):
+        """State IDs from highest to lowest; states with no data are left out."""
+        return self._present(label, year, by)
+
+    def top_k(self, label, year, k, by='value'):
+        """State IDs of the k highest states."""
+        return self._present(label, year, by)[:k]
+
+    def bottom_k(self, label, year, k, by='value'):
+        """State IDs of the k lowest states, lowest first."""
+        return self._present(label, year, by)[::-1][:k]
+
+    def rank_history(self, label, by='value'):
+        """(state, year) matrix of ranks for one metric; 0 where there is no data."""
+        return self.ranks[by][:, :, self.tensor.metric_index(label)]
+
+@st.cache_resource
+@disk_cache(version=dataset_version)
+def build_ranking_engine():
+    """Rank every state for every metric and year (cached and shared across sessions)."""
+    return RankingEngine(build_metric_tensor())
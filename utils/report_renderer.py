@@ -0,0 +1,200 @@
+"""Headless batch renderer for the monthly static chart reports.
+
+Renders every page/view combination published each month with the same
+figure builders the dashboard uses:
+
+- Page 1: revenue by state, one chart per year
+- Page 3: REx and CEx by state, one chart per year
+- Pages 4-6: per-state composition (tabs 1-2) and per-year state
+  comparison (tabs 3-4)
+
+Usage:
+    python -m utils.report_renderer --out reports --format html
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from utils.data_loader import (
+    load_and_clean_data,
+    load_component_totals,
+    load_state_finances,
+    load_state_revex_capex,
+    melt_state_finances,
+)
+from utils.revex_capex_dashboard import (
+    create_composition_subplots,
+    create_state_comparison_chart,
+    prepare_state_comparison,
+)
+from utils.utils import create_expenditure_bar_chart, create_revenue_bar_chart, get_distinct_colors
+
+# Bump when a figure builder changes so every output is re-rendered.
+RENDERER_VERSION = "3"
+MANIFEST_NAME = "manifest.json"
+
+STATE_FINANCES_PATH = "data/state_finances.csv"
+REVEX_CAPEX_PATH = "data/state_revex_capex.csv"
+COMPONENT_DASHBOARDS = {
+    "capex_components": "data/states_capex_components.csv",
+    "revex_components": "data/states_revex_components.csv",
+    "public_liability_debt": "data/states_public_liability_debt.csv",
+}
+
+# ========== DATA (cached per worker process) ==========
+@lru_cache(maxsize=None)
+def _revenue_long():
+    return melt_state_finances(load_state_finances(STATE_FINANCES_PATH))
+
+@lru_cache(maxsize=None)
+def _revex_capex_long():
+    return load_state_revex_capex(REVEX_CAPEX_PATH)
+
+@lru_cache(maxsize=None)
+def _components(data_path):
+    df_full = load_and_clean_data(data_path)
+    all_components = sorted(df_full['component'].unique())
+    component_colors = dict(zip(all_components, get_distinct_colors(len(all_components))))
+    return df_full, load_component_totals(data_path), all_components, component_colors
+
+@lru_cache(maxsize=None)
+def file_digest(path):
+    """SHA-256 of a data file's contents."""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def _slug(text):
+    return re.sub(r"[^a-z0-9]+", "_", str(text).lower()).strip("_")
+
+# ========== JOBS ==========
+def build_jobs():
+    """Enumerate every (view, state/year) combination to render."""
+    jobs = []
+
+    for year in sorted(_revenue_long()['Year'].unique()):
+        jobs.append({"view": "revenue_by_state", "input": STATE_FINANCES_PATH, "year": int(year)})
+
+    for year in sorted(_revex_capex_long()['Year'].dropna().unique()):
+        for kind in ("REx", "CEx"):
+            jobs.append({"view": "revex_capex_by_state", "input": REVEX_CAPEX_PATH, "year": year, "type": kind})
+
+    for name, data_path in COMPONENT_DASHBOARDS.items():
+        df_full = _components(data_path)[0]
+        for state in sorted(df_full['state'].unique()):
+            for mode in ("percent", "raw"):
+                jobs.append({"view": "composition", "dataset": name, "input": data_path, "state": state, "mode": mode})
+        for year in sorted(df_full['year'].unique()):
+            for mode in ("percent", "raw"):
+                jobs.append({"view": "state_comparison", "dataset": name, "input": data_path, "year": int(year), "mode": mode})
+
+    return jobs
+
+def job_name(job):
+    """Output file stem for a job."""
+    parts = [job["view"], job.get("dataset"), job.get("state"), job.get("year"), job.get("type"), job.get("mode")]
+    return "__".join(_slug(p) for p in parts if p is not None)
+
+def job_fingerprint(job):
+    """Hash of everything an output depends on: input data, job and renderer version."""
+    payload = json.dumps(job, sort_keys=True) + file_digest(job["input"]) + RENDERER_VERSION
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def render_figure(job):
+    """Build the Plotly figure for a single job."""
+    view = job["view"]
+
+    if view == "revenue_by_state":
+        data_long = _revenue_long()
+        data_year = data_long[data_long['Year'] == job["year"]].sort_values("Value", ascending=True)
+        return create_revenue_bar_chart(data_year, job["year"])
+
+    if view == "revex_capex_by_state":
+        df_long = _revex_capex_long()
+        df_view = df_long[(df_long["Year"] == job["year"]) & (df_long["Type"] == job["type"])]
+        label = "Revenue Expenditure" if job["type"] == "REx" else "Capital Expenditure"
+        return create_expenditure_bar_chart(df_view, f"{label} by State ({job['year']})")
+
+    df_full, totals, all_components, component_colors = _components(job["input"])
+    is_percentage = job["mode"] == "percent"
+
+    if view == "composition":
+        df_state = df_full[df_full['state'] == job["state"]]
+        return create_composition_subplots(
+            df_state, totals, [job["state"]], all_components, component_colors, is_percentage
+        )
+
+    if view == "state_comparison":
+        df_year = prepare_state_comparison(df_full, totals, job["year"], is_percentage)
+        return create_state_comparison_chart(
+            df_year, component_colors, f"{job['dataset']} - {job['year']}", is_percentage
+        )
+
+    raise ValueError(f"Unknown view: {view}")
+
+def _render_job(args):
+    job, out_dir, formats = args
+    fig = render_figure(job)
+    stem = os.path.join(out_dir, job_name(job))
+    if "html" in formats:
+        fig.write_html(f"{stem}.html", include_plotlyjs=True, full_html=True)
+    if "json" in formats:
+        with open(f"{stem}.json", "w", encoding="utf-8") as f:
+            f.write(fig.to_json())
+    return job_name(job)
+
+# ========== DRIVER ==========
+def _load_manifest(out_dir):
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def _outputs_exist(out_dir, name, formats):
+    return all(os.path.exists(os.path.join(out_dir, f"{name}.{fmt}")) for fmt in formats)
+
+def render_all(out_dir="reports", formats=("html",), workers=None, force=False):
+    """Render every job whose inputs changed since the last run; returns rendered names."""
+    os.makedirs(out_dir, exist_ok=True)
+    formats = tuple(sorted(formats))
+    manifest = _load_manifest(out_dir)
+
+    pending = []
+    fingerprints = {}
+    for job in build_jobs():
+        name = job_name(job)
+        fingerprints[name] = job_fingerprint(job) + ":" + ",".join(formats)
+        if force or manifest.get(name) != fingerprints[name] or not _outputs_exist(out_dir, name, formats):
+            pending.append(job)
+
+    rendered = []
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            args = [(job, out_dir, formats) for job in pending]
+            for name in executor.map(_render_job, args, chunksize=8):
+                rendered.append(name)
+                manifest[name] = fingerprints[name]
+
+    with open(os.path.join(out_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    return rendered
+
+def main():
+    parser = argparse.ArgumentParser(description="Render all dashboard charts to static files.")
+    parser.add_argument("--out", default="reports", help="Output directory")
+    parser.add_argument("--format", choices=["html", "json", "both"], default="html")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Re-render even if inputs are unchanged")
+    args = parser.parse_args()
+
+    formats = ("html", "json") if args.format == "both" else (args.format,)
+    rendered = render_all(args.out, formats, args.workers, args.force)
+    print(f"Rendered {len(rendered)} charts to {args.out}")
+
+if __name__ == "__main__":
+    main()
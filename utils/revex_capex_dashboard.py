@@ -1,11 +1,18 @@
+import os
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
-from utils.data_loader import load_and_clean_data
+from utils.data_loader import dataset_version, load_and_clean_data, load_component_totals, reconcile_totals
 from plotly.subplots import make_subplots
+from utils.constants import datasets
+from utils.aggregates import TOTAL_LABEL, build_metric_tensor
+from utils.animation import build_composition_playback
+from utils.entities import states, unmatched_report
+from utils.forecasting import build_forecasts
+from utils.paginated_table import build_table_index, paginated_table
+from utils.ranking import build_ranking_engine
 from utils.utils import download_cleaned_data, get_distinct_colors, create_stacked_bar_chart
-from functools import lru_cache
 
 # ========== CACHING & OPTIMIZATION ==========
 @st.cache_data
@@ -19,11 +26,146 @@ def prepare_component_colors(components):
     return dict(zip(sorted(components), get_cached_colors(len(components))))
 
 # ========== HELPER FUNCTIONS ==========
-def create_percentage_share(df, group_cols):
-    """Calculate percentage share for grouped data."""
-    return (
-        df.groupby(group_cols)['value']
-        .transform(lambda x: (x / x.sum() * 100) if x.sum() > 0 else 0)
+def create_percentage_share(df, totals):
+    """Calculate each component's percentage share of its published state-year total."""
+    known = totals[totals['state_id'] >= 0]
+    denominators = known.set_index(['state_id', 'year'])['total']
+    total = denominators.reindex(pd.MultiIndex.from_arrays([df['state_id'], df['year']])).to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        share = df['value'].to_numpy() / total * 100
+    return pd.Series(np.where(total > 0, share, 0), index=df.index)
+
+@st.cache_resource
+def load_dashboard_data(data_path):
+    """
+    (df_full with a precomputed 'share_%' column, published totals,
+    reconciliation report, cleaned CSV bytes) for one component file.
+
+    Shared across sessions; treat as read-only and filter without copying.
+    """
+    df_full = load_and_clean_data(data_path)
+    totals = load_component_totals(data_path)
+    if df_full.empty:
+        return df_full, totals, None, b""
+    csv_data = download_cleaned_data(df_full)
+    reconciliation = reconcile_totals(df_full, totals, ['state', 'year'], 'value', 'total')
+    df_full = df_full.assign(**{'share_%': create_percentage_share(df_full, totals)})
+    return df_full, totals, reconciliation, csv_data
+
+# ========== FIGURE BUILDERS ==========
+def create_composition_subplots(df, totals, selected_states, all_components, component_colors, is_percentage, forecast=None):
+    """
+    Build the per-state stacked composition subplots (tabs 1 and 2).
+
+    `forecast` is an optional tidy frame from Forecasts.frame(); its years are
+    drawn as hatched bars after the actual ones.
+    """
+    if forecast is not None:
+        forecast_totals = forecast[forecast['component'] == TOTAL_LABEL].rename(columns={'value': 'total'})
+        forecast = forecast[forecast['component'] != TOTAL_LABEL]
+
+    if is_percentage:
+        # Copy-on-write: assign() never touches the caller's (possibly shared) frame
+        if 'share_%' not in df:
+            df = df.assign(**{'share_%': create_percentage_share(df, totals)})
+        if forecast is not None:
+            forecast = forecast.assign(**{'share_%': create_percentage_share(forecast, forecast_totals)})
+        y_col = 'share_%'
+        hover = "Share: %{y:.1f}%"
+    else:
+        y_col = 'value'
+        hover = "Value: ₹%{y:,.0f} Cr"
+
+    fig = make_subplots(
+        rows=1, cols=len(selected_states),
+        specs=[[{'type': 'bar'} for _ in selected_states]],
+        subplot_titles=selected_states,
+        horizontal_spacing=0.12
+    )
+
+    for idx, (state, state_id) in enumerate(zip(selected_states, states.encode(selected_states)), 1):
+        df_state = df[states.isin(df['state_id'], df['state'], [state])].sort_values(['year', 'component'])
+
+        for component in all_components:
+            df_comp = df_state[df_state['component'] == component]
+            if df_comp.empty:
+                continue
+
+            fig.add_trace(
+                go.Bar(
+                    x=df_comp['year'],
+                    y=df_comp[y_col],
+                    name=component,
+                    showlegend=(idx == 1),
+                    marker_color=component_colors[component],
+                    hovertemplate=f"<b>{component}</b><br>Year: %{{x}}<br>{hover}<extra></extra>",
+                    legendgroup=component,
+                ),
+                row=1, col=idx
+            )
+
+            if forecast is not None:
+                fc_comp = forecast[(forecast['state_id'] == state_id) & (forecast['component'] == component)]
+                fig.add_trace(
+                    go.Bar(
+                        x=fc_comp['year'],
+                        y=fc_comp[y_col],
+                        name=f"{component} (forecast)",
+                        showlegend=False,
+                        marker=dict(color=component_colors[component], opacity=0.5, pattern_shape="/"),
+                        hovertemplate=f"<b>{component}</b> (forecast)<br>Year: %{{x}}<br>{hover}<extra></extra>",
+                        legendgroup=component,
+                    ),
+                    row=1, col=idx
+                )
+
+        fig.update_xaxes(title_text="Year", row=1, col=idx)
+        if is_percentage:
+            if idx == 1:
+                fig.update_yaxes(title_text="Percentage (%)", range=[0, 100], row=1, col=idx)
+            else:
+                fig.update_yaxes(range=[0, 100], row=1, col=idx)
+        elif idx == 1:
+            fig.update_yaxes(title_text="Value (₹ Crores)", row=1, col=idx)
+
+    fig.update_layout(
+        barmode='stack',
+        height=max(500, len(selected_states) * 80),
+        hovermode='x unified',
+        legend=dict(yanchor="top", y=0.99, xanchor="left", x=1.02),
+        dragmode='zoom',
+        margin=dict(b=50, l=50, r=50, t=50)
+    )
+    return fig
+
+def prepare_state_comparison(df_full, totals, selected_year, is_percentage, state_order=None):
+    """Filter one year for the state comparison tabs (3 and 4) and order it."""
+    df_year = df_full[df_full['year'] == selected_year]
+    if not is_percentage:
+        return df_year.sort_values(['state', 'component'])
+
+    if 'share_%' not in df_year:
+        df_year = df_year.assign(**{'share_%': create_percentage_share(df_year, totals)})
+
+    # Sort logic: precomputed order first, states without data for it last
+    if state_order is not None:
+        remaining = sorted(set(df_year['state']) - set(state_order))
+        df_year = df_year.assign(state=pd.Categorical(df_year['state'], categories=list(state_order) + remaining, ordered=True))
+    return df_year.sort_values(['state', 'component'])
+
+def create_state_comparison_chart(df_year, component_colors, title, is_percentage):
+    """Build the horizontal stacked state comparison chart (tabs 3 and 4)."""
+    return create_stacked_bar_chart(
+        data=df_year,
+        x_col='share_%' if is_percentage else 'value',
+        y_col='state',
+        color_col='component',
+        colors=component_colors,
+        title=title,
+        height=max(400, len(df_year['state'].unique()) * 35),
+        x_label="Percentage (%)" if is_percentage else "Value (₹ Crores)",
+        y_label="State",
+        is_percentage=is_percentage
     )
 
 # ========== MAIN DASHBOARD FUNCTION ==========
@@ -34,7 +176,8 @@ def create_expenditure_dashboard(
     tab1_title,
     tab2_title,
     tab3_title,
-    tab4_title
+    tab4_title,
+    dataset_name=None
 ):
     """
     Enhanced reusable function to create expenditure analysis dashboard.
@@ -45,23 +188,34 @@ def create_expenditure_dashboard(
     - Better error handling
     - Responsive UI with metrics
     - Improved interactivity
+
+    `dataset_name` is the file's key in constants.datasets; it turns on
+    component sorting, forecasts, anomalies and playback, which read the
+    metric tensor. If omitted, it is looked up from `data_path`.
     """
     
     st.set_page_config(page_title=page_title, layout="wide")
     st.title(page_title)
     
     # ===== DATA LOADING =====
-    df_full = load_and_clean_data(data_path)
+    df_full, totals, reconciliation, csv_data = load_dashboard_data(data_path)
+    ranking = build_ranking_engine()
+    if dataset_name is None:
+        dataset_name = next((name for name, (_, path) in datasets.items() if os.path.normpath(path) == os.path.normpath(data_path)), None)
     
     if df_full.empty:
         st.error(f"⚠️ No data found in {data_path}. Please check the file path.")
         st.stop()
+    if dataset_name is None:
+        st.warning(
+            f"⚠️ {data_path} is not a registered dataset, so component sorting, forecasts, "
+            "anomalies and playback are unavailable."
+        )
     
     # ===== DOWNLOAD SECTION =====
     with st.container(border=True):
         col1, col2, col3 = st.columns([1, 3, 1])
         with col1:
-            csv_data = download_cleaned_data(df_full)
             st.download_button(
                 label="📥 Download Cleaned Data",
                 data=csv_data,
@@ -76,12 +230,61 @@ def create_expenditure_dashboard(
                 delta=f"{len(df_full['state'].unique())} states"
             )
     
+    unmatched = unmatched_report(df_full, 'state', 'component')
+    if unmatched['states'] or unmatched['components']:
+        st.warning(
+            "⚠️ Names not in the canonical dictionary: "
+            + ", ".join(unmatched['states'] + unmatched['components'])
+        )
+    
+    # ===== RECONCILIATION =====
+    flagged = reconciliation[reconciliation['flagged']]
+    with st.expander(f"🧮 Components vs Published Totals ({len(flagged)} mismatched state-years)"):
+        if flagged.empty:
+            st.success("All components add up to the published state totals.")
+        else:
+            st.dataframe(flagged.drop(columns='flagged').reset_index(drop=True), use_container_width=True)
+    
+    # ===== ANOMALIES =====
+    if dataset_name is not None:
+        anomalies = build_metric_tensor().anomalies(dataset_name)
+        with st.expander(f"🚩 Anomalies ({len(anomalies)} flagged points)"):
+            st.caption(
+                "Level score: deviation from the 5-year rolling median (robust z). "
+                "Change score: YoY change compared with all states in the same year (robust z)."
+            )
+            st.dataframe(
+                anomalies.drop(columns=['state_id', 'metric']).sort_values(['state', 'year']),
+                hide_index=True,
+                use_container_width=True
+            )
+    
     # ===== PREPARE DATA =====
     all_components = sorted(df_full['component'].unique())
     component_colors = prepare_component_colors(all_components)
     states_list = sorted(df_full['state'].unique())
     years_list = sorted(df_full['year'].unique())
     
+    # ===== DATA TABLE =====
+    with st.expander("📋 View Data Table"):
+        col1, col2 = st.columns(2)
+        with col1:
+            table_states = st.multiselect("Filter States", states_list, key="table_states")
+        with col2:
+            table_components = st.multiselect("Filter Components", all_components, key="table_components")
+        table_filters = {}
+        if table_states:
+            table_filters['state'] = table_states
+        if table_components:
+            table_filters['component'] = table_components
+        table_index = build_table_index(
+            f"{data_path}:{dataset_version()}",
+            df_full[['state', 'component', 'year', 'value']],
+            {"Year, Value": ['year', 'value'], "Value": ['value'], "State, Year": ['state', 'year'], "Component, Year": ['component', 'year']},
+            filter_columns=('state', 'component')
+        )
+        paginated_table(table_index, key="data_table", filters=table_filters, default_sort="Year, Value", default_descending=True)
+    
     # ===== TABS =====
     tab1, tab2, tab3, tab4 = st.tabs([tab1_title, tab2_title, tab3_title, tab4_title])
     
@@ -99,52 +302,14 @@ def create_expenditure_dashboard(
             )
         with col2:
             st.caption(f"📊 {len(selected_states)} selected")
+            show_forecast = st.checkbox("Show Forecast", value=False, key="tab1_forecast")
         
         if selected_states:
-            df_tab1 = df_full[df_full['state'].isin(selected_states)].copy()
-            df_tab1['share_%'] = create_percentage_share(df_tab1, ['state', 'year'])
-            
-            fig = make_subplots(
-                rows=1, cols=len(selected_states),
-                specs=[[{'type': 'bar'} for _ in selected_states]],
-                subplot_titles=selected_states,
-                horizontal_spacing=0.12
-            )
-            
-            for idx, state in enumerate(selected_states, 1):
-                df_state = df_tab1[df_tab1['state'] == state].sort_values(['year', 'component'])
-                
-                for component in all_components:
-                    df_comp = df_state[df_state['component'] == component]
-                    if df_comp.empty:
-                        continue
-                    
-                    fig.add_trace(
-                        go.Bar(
-                            x=df_comp['year'],
-                            y=df_comp['share_%'],
-                            name=component,
-                            showlegend=(idx == 1),
-                            marker_color=component_colors[component],
-                            hovertemplate=f"<b>{component}</b><br>Year: %{{x}}<br>Share: %{{y:.1f}}%<extra></extra>",
-                            legendgroup=component,
-                        ),
-                        row=1, col=idx
-                    )
-                
-                fig.update_xaxes(title_text="Year", row=1, col=idx)
-                if idx == 1:
-                    fig.update_yaxes(title_text="Percentage (%)", range=[0, 100], row=1, col=idx)
-                else:
-                    fig.update_yaxes(range=[0, 100], row=1, col=idx)
-            
-            fig.update_layout(
-                barmode='stack',
-                height=max(500, len(selected_states) * 80),
-                hovermode='x unified',
-                legend=dict(yanchor="top", y=0.99, xanchor="left", x=1.02),
-                dragmode='zoom',
-                margin=dict(b=50, l=50, r=50, t=50)
+            df_tab1 = df_full[states.isin(df_full['state_id'], df_full['state'], selected_states)]
+            forecast = build_forecasts().frame(dataset_name) if show_forecast and dataset_name else None
+            fig = create_composition_subplots(
+                df_tab1, totals, selected_states, all_components, component_colors,
+                is_percentage=True, forecast=forecast
             )
             st.plotly_chart(fig, use_container_width=True)
     
@@ -162,49 +327,14 @@ def create_expenditure_dashboard(
             )
         with col2:
             st.caption(f"📊 {len(selected_states)} selected")
+            show_forecast = st.checkbox("Show Forecast", value=False, key="tab2_forecast")
         
         if selected_states:
-            df_tab2 = df_full[df_full['state'].isin(selected_states)].copy()
-            
-            fig = make_subplots(
-                rows=1, cols=len(selected_states),
-                specs=[[{'type': 'bar'} for _ in selected_states]],
-                subplot_titles=selected_states,
-                horizontal_spacing=0.12
-            )
-            
-            for idx, state in enumerate(selected_states, 1):
-                df_state = df_tab2[df_tab2['state'] == state].sort_values(['year', 'component'])
-                
-                for component in all_components:
-                    df_comp = df_state[df_state['component'] == component]
-                    if df_comp.empty:
-                        continue
-                    
-                    fig.add_trace(
-                        go.Bar(
-                            x=df_comp['year'],
-                            y=df_comp['value'],
-                            name=component,
-                            showlegend=(idx == 1),
-                            marker_color=component_colors[component],
-                            hovertemplate=f"<b>{component}</b><br>Year: %{{x}}<br>Value: ₹%{{y:,.0f}} Cr<extra></extra>",
-                            legendgroup=component,
-                        ),
-                        row=1, col=idx
-                    )
-                
-                fig.update_xaxes(title_text="Year", row=1, col=idx)
-                if idx == 1:
-                    fig.update_yaxes(title_text="Value (₹ Crores)", row=1, col=idx)
-            
-            fig.update_layout(
-                barmode='stack',
-                height=max(500, len(selected_states) * 80),
-                hovermode='x unified',
-                legend=dict(yanchor="top", y=0.99, xanchor="left", x=1.02),
-                dragmode='zoom',
-                margin=dict(b=50, l=50, r=50, t=50)
+            df_tab2 = df_full[states.isin(df_full['state_id'], df_full['state'], selected_states)]
+            forecast = build_forecasts().frame(dataset_name) if show_forecast and dataset_name else None
+            fig = create_composition_subplots(
+                df_tab2, totals, selected_states, all_components, component_colors,
+                is_percentage=False, forecast=forecast
             )
             st.plotly_chart(fig, use_container_width=True)
     
@@ -221,21 +351,13 @@ def create_expenditure_dashboard(
                 options=["None"] + all_components,
                 key="tab3_sort_component"
             )
+        animate = st.checkbox("▶ Play Through Years", value=False, key="tab3_animate", disabled=dataset_name is None)
         
-        df_tab3 = df_full[df_full['year'] == selected_year].copy()
-        df_tab3['share_%'] = create_percentage_share(df_tab3, ['state'])
-        
-        # Sort logic
-        if sort_component != "None":
-            state_order = (
-                df_tab3[df_tab3['component'] == sort_component]
-                .sort_values('share_%', ascending=False)['state']
-                .tolist()
-            )
-            df_tab3['state'] = pd.Categorical(df_tab3['state'], categories=state_order, ordered=True)
-            df_tab3 = df_tab3.sort_values(['state', 'component'])
-        else:
-            df_tab3 = df_tab3.sort_values(['state', 'component'])
+        state_order = None
+        if sort_component != "None" and dataset_name is not None:
+            label = f"{datasets[dataset_name][0]}: {sort_component}"
+            state_order = states.decode(ranking.sort_order(label, selected_year, by='share'))
+        df_tab3 = prepare_state_comparison(df_full, totals, selected_year, True, state_order)
         
         # Metrics
         col1, col2, col3, col4 = st.columns(4)
@@ -249,19 +371,17 @@ def create_expenditure_dashboard(
             total_value = df_tab3['value'].sum()
             st.metric("Total Value", f"₹{total_value:,.0f} Cr")
         
-        # Chart
-        fig = create_stacked_bar_chart(
-            data=df_tab3,
-            x_col='share_%',
-            y_col='state',
-            color_col='component',
-            colors=component_colors,
-            title=f"{tab3_title} - {selected_year}",
-            height=max(400, len(df_tab3['state'].unique()) * 35),
-            x_label="Percentage (%)",
-            y_label="State",
-            is_percentage=True
-        )
+        # Chart (the static one also stands in when there is nothing to animate)
+        fig = None
+        if animate and dataset_name is not None:
+            fig = build_composition_playback(
+                dataset_name, selected_year, tab3_title, True, component_colors,
+                None if state_order is None else tuple(state_order)
+            )
+        if fig is None:
+            fig = create_state_comparison_chart(
+                df_tab3, component_colors, f"{tab3_title} - {selected_year}", is_percentage=True
+            )
         
         st.plotly_chart(fig, use_container_width=True)
     
@@ -274,9 +394,9 @@ def create_expenditure_dashboard(
             selected_year = st.selectbox("Select Year", years_list, index=len(years_list)-1, key="tab4_year")
         with col2:
             st.caption(f"📊 Showing data for {selected_year}")
+            animate = st.checkbox("▶ Play Through Years", value=False, key="tab4_animate", disabled=dataset_name is None)
         
-        df_tab4 = df_full[df_full['year'] == selected_year].copy()
-        df_tab4 = df_tab4.sort_values(['state', 'component'])
+        df_tab4 = prepare_state_comparison(df_full, totals, selected_year, False)
         
         # Metrics
         col1, col2, col3, col4 = st.columns(4)
@@ -290,18 +410,13 @@ def create_expenditure_dashboard(
             total_value = df_tab4['value'].sum()
             st.metric("Total Value", f"₹{total_value:,.0f} Cr")
         
-        # Chart
-        fig = create_stacked_bar_chart(
-            data=df_tab4,
-            x_col='value',
-            y_col='state',
-            color_col='component',
-            colors=component_colors,
-            title=f"{tab4_title} - {selected_year}",
-            height=max(400, len(df_tab4['state'].unique()) * 35),
-            x_label="Value (₹ Crores)",
-            y_label="State",
-            is_percentage=False
-        )
+        # Chart (the static one also stands in when there is nothing to animate)
+        fig = None
+        if animate and dataset_name is not None:
+            fig = build_composition_playback(dataset_name, selected_year, tab4_title, False, component_colors)
+        if fig is None:
+            fig = create_state_comparison_chart(
+                df_tab4, component_colors, f"{tab4_title} - {selected_year}", is_percentage=False
+            )
         
         st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
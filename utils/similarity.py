@@ -0,0 +1,145 @@
+"""
+Fiscal-profile similarity: "which states look most like X?"
+
+Each state-year of a component dataset becomes a composition vector (the
+component shares, summing to 1). Each year's neighbour lists are
+precomputed once with nearest_neighbors(), which works through the distance
+matrix in row blocks, so memory stays at one block even at district-level
+entity counts. Peer queries are lookups, and clustering is a few vectorized
+k-means iterations in the space of the chosen distance.
+"""
+import numpy as np
+import streamlit as st
+from utils.aggregates import TOTAL_LABEL, build_metric_tensor
+from utils.data_loader import dataset_version
+from utils.disk_cache import disk_cache
+
+METRICS = {"euclidean": "Euclidean", "cosine": "Cosine", "hellinger": "Hellinger"}
+
+def composition_vectors(values):
+    """Row-normalize non-negative component values (..., components) into shares."""
+    values = np.clip(np.nan_to_num(values), 0, None)
+    totals = values.sum(axis=-1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(totals > 0, values / totals, 0.0)
+
+def pairwise_distances(a, b=None, metric="euclidean"):
+    """Distances between the rows of a and b (default a) along the last two axes."""
+    if metric == "hellinger":
+        a = np.sqrt(a)
+        b = None if b is None else np.sqrt(b)
+    b = a if b is None else b
+
+    if metric == "cosine":
+        norm_a = np.linalg.norm(a, axis=-1, keepdims=True)
+        norm_b = np.linalg.norm(b, axis=-1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            similarity = (a / norm_a) @ np.swapaxes(b / norm_b, -1, -2)
+        return 1 - np.nan_to_num(similarity)
+
+    # |a - b|^2 = |a|^2 + |b|^2 - 2 a.b, clipped for round-off
+    sq_a = (a ** 2).sum(axis=-1)[..., :, None]
+    sq_b = (b ** 2).sum(axis=-1)[..., None, :]
+    distances = np.sqrt(np.clip(sq_a + sq_b - 2 * a @ np.swapaxes(b, -1, -2), 0, None))
+    return distances / np.sqrt(2) if metric == "hellinger" else distances
+
+def nearest_neighbors(vectors, k, metric="euclidean", block_size=1024):
+    """(indices, distances) of the k nearest other rows, computed in row blocks."""
+    n = len(vectors)
+    k = max(min(k, n - 1), 0)
+    indices = np.empty((n, k), dtype=np.int64)
+    distances = np.empty((n, k))
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        block = pairwise_distances(vectors[start:stop], vectors, metric)
+        block[np.arange(stop - start), np.arange(start, stop)] = np.inf
+        nearest = np.argpartition(block, k, axis=1)[:, :k]
+        nearest_dist = np.take_along_axis(block, nearest, axis=1)
+        order = np.argsort(nearest_dist, axis=1)
+        indices[start:stop] = np.take_along_axis(nearest, order, axis=1)
+        distances[start:stop] = np.take_along_axis(nearest_dist, order, axis=1)
+    return indices, distances
+
+def kmeans(vectors, n_clusters, n_iter=50, seed=0):
+    """Plain vectorized k-means with k-means++ seeding; returns (labels, centroids)."""
+    if not len(vectors):
+        return np.empty(0, dtype=np.int64), vectors[:0]
+    rng = np.random.default_rng(seed)
+    centroids = vectors[[rng.integers(len(vectors))]]
+    for _ in range(1, n_clusters):
+        d2 = pairwise_distances(vectors, centroids).min(axis=1) ** 2
+        p = d2 / d2.sum() if d2.sum() > 0 else None
+        centroids = np.vstack([centroids, vectors[rng.choice(len(vectors), p=p)]])
+
+    labels = np.zeros(len(vectors), dtype=np.int64)
+    for i in range(n_iter):
+        new_labels = pairwise_distances(vectors, centroids).argmin(axis=1)
+        if i and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        one_hot = np.eye(n_clusters)[labels]
+        counts = one_hot.sum(axis=0)[:, None]
+        centroids = np.where(counts > 0, one_hot.T @ vectors / np.maximum(counts, 1), centroids)
+    return labels, centroids
+
+def project_2d(vectors):
+    """First two principal components, for plotting (zeros where there are fewer)."""
+    projection = np.zeros((len(vectors), 2))
+    if len(vectors):
+        centred = vectors - vectors.mean(axis=0)
+        _, _, vt = np.linalg.svd(centred, full_matrices=False)
+        projection[:, :min(2, len(vt))] = centred @ vt[:2].T
+    return projection
+
+class SimilarityIndex:
+    """Composition vectors and precomputed neighbour lists for every year of one dataset."""
+
+    def __init__(self, tensor, dataset, metric="euclidean"):
+        metric_idx = np.flatnonzero(
+            (tensor.metric_datasets == dataset) & (tensor.metric_components != TOTAL_LABEL)
+        )
+        self.dataset = dataset
+        self.metric = metric
+        self.states = tensor.states
+        self.years = tensor.years
+        self.components = tensor.metric_components[metric_idx]
+
+        # (year, state, component); states with no data that year are excluded from results
+        values = tensor.values[:, :, metric_idx].transpose(1, 0, 2)
+        self.has_data = ~np.isnan(values).all(axis=-1)
+        self.vectors = composition_vectors(values)
+
+        # Per year: every state with data, ranked by distance from each state with data
+        self.neighbors = []
+        for y in range(len(self.years)):
+            state_ids = np.flatnonzero(self.has_data[y])
+            indices, distances = nearest_neighbors(self.vectors[y, state_ids], len(state_ids), metric)
+            self.neighbors.append((state_ids, state_ids[indices], distances))
+
+    def peers(self, state_id, year, k):
+        """(state IDs, distances) of the k most similar states."""
+        state_ids, indices, distances = self.neighbors[int(np.searchsorted(self.years, year))]
+        row = np.flatnonzero(state_ids == state_id)
+        if not row.size:
+            return state_ids[:0], np.empty(0)
+        return indices[row[0], :k], distances[row[0], :k]
+
+    def clusters(self, year, n_clusters):
+        """(state IDs with data, cluster labels, 2D projection) for one year; all empty if none."""
+        y = int(np.searchsorted(self.years, year))
+        state_ids = np.flatnonzero(self.has_data[y])
+        vectors = self.vectors[y, state_ids]
+        # k-means is Euclidean, so map vectors to where that matches the chosen distance
+        if self.metric == "hellinger":
+            vectors = np.sqrt(vectors)
+        elif self.metric == "cosine":
+            norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+            vectors = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+        labels, _ = kmeans(vectors, min(n_clusters, len(state_ids)))
+        return state_ids, labels, project_2d(vectors)
+
+@st.cache_resource
+@disk_cache(version=dataset_version)
+def build_similarity_index(dataset, metric="euclidean"):
+    """Similarity index for one component dataset (cached and shared across sessions)."""
+    return SimilarityIndex(build_metric_tensor(), dataset, metric)
@@ -0,0 +1,168 @@
+"""
+Embedded, read-only SQL layer over the cleaned datasets.
+
+Every tidy frame from the dataset registry becomes a table in an in-memory
+SQLite database, alongside the published totals and the state/component
+dictionaries, with indexes on state, year and component. The database is
+built once per process; query results are cached per (query, dataset
+version) and report their execution time.
+
+The connection is shared by every session, so once it is built an
+authorizer only lets statements read: writes, DDL, PRAGMA, ATTACH and
+transactions are refused before they run. A query is stopped after
+QUERY_TIMEOUT_S and results are cut at MAX_ROWS, so a runaway query can
+neither hold the connection for long nor use up memory.
+"""
+import sqlite3
+import threading
+import time
+import pandas as pd
+import streamlit as st
+from utils.constants import datasets, state_to_initial
+from utils.data_loader import dataset_version, load_all_tidy_datasets, load_component_totals, load_state_revenue_totals
+from utils.entities import components, states
+
+EXAMPLE_QUERIES = {
+    "Health share of capex, all states, 2018-19 onwards": """SELECT f.state, f.year,
+       ROUND(100.0 * f.value / t.total, 2) AS health_share_pct
+FROM capex_components f
+JOIN totals t
+  ON t.dataset = 'capex_components' AND t.state_id = f.state_id AND t.year = f.year
+WHERE f.component = 'Health & Family Welfare' AND f.year >= 2018
+ORDER BY f.year, health_share_pct DESC""",
+    "Debt to revenue ratio, latest year": """SELECT d.state, d.year,
+       ROUND(d.total / r.value, 2) AS debt_to_revenue
+FROM totals d
+JOIN revenue_receipts r ON r.state_id = d.state_id AND r.year = d.year
+WHERE d.dataset = 'public_liability_debt'
+  AND d.year = (SELECT MAX(year) FROM totals)
+ORDER BY debt_to_revenue DESC""",
+    "Capex as % of total expenditure by year": """SELECT year,
+       ROUND(100.0 * SUM(CASE WHEN component = 'CEx' THEN value END) / SUM(value), 2) AS capex_pct
+FROM revex_capex
+GROUP BY year
+ORDER BY year""",
+}
+
+QUERY_TIMEOUT_S = 5.0
+MAX_ROWS = 10000
+PROGRESS_STEPS = 10000  # SQLite VM instructions between deadline checks
+
+# Authorizer actions a read-only query needs; everything else is denied
+ALLOWED_ACTIONS = {sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION, sqlite3.SQLITE_RECURSIVE}
+
+def _read_only_authorizer(action, arg1, arg2, db_name, source):
+    return sqlite3.SQLITE_OK if action in ALLOWED_ACTIONS else sqlite3.SQLITE_DENY
+
+def _create_database():
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+
+    conn.execute("CREATE TABLE states (state_id INTEGER PRIMARY KEY, state TEXT, initial TEXT)")
+    conn.executemany(
+        "INSERT INTO states VALUES (?, ?, ?)",
+        [(i, name, state_to_initial[name]) for i, name in enumerate(states.names)]
+    )
+    conn.execute("CREATE TABLE components (component_id INTEGER PRIMARY KEY, component TEXT)")
+    conn.executemany("INSERT INTO components VALUES (?, ?)", list(enumerate(components.names)))
+
+    for name, df in load_all_tidy_datasets().items():
+        df.to_sql(name, conn, index=False)
+        conn.execute(f"CREATE INDEX idx_{name}_state ON {name} (state_id, year)")
+        conn.execute(f"CREATE INDEX idx_{name}_year ON {name} (year)")
+        conn.execute(f"CREATE INDEX idx_{name}_component ON {name} (component_id, year)")
+
+    totals = [
+        load_component_totals(datasets[name][1]).assign(dataset=name)
+        for name in ("capex_components", "revex_components", "public_liability_debt")
+    ]
+    totals.append(
+        load_state_revenue_totals(datasets["revenue_components"][1])
+        .rename(columns={'State': 'state', 'Total': 'total'})
+        .assign(year=lambda df: df['Year'].str[:4].astype(int), dataset="revenue_components")
+    )
+    totals = pd.concat(totals, ignore_index=True)
+    totals = totals[totals['state_id'] >= 0][['dataset', 'state', 'state_id', 'year', 'total']]
+    totals.to_sql("totals", conn, index=False)
+    conn.execute("CREATE INDEX idx_totals ON totals (dataset, state_id, year)")
+    conn.execute("CREATE INDEX idx_totals_year ON totals (year)")
+
+    conn.execute("ANALYZE")
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+def _read_schema(conn):
+    tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name")]
+    return {
+        table: [(row[1], row[2]) for row in conn.execute(f"PRAGMA table_info({table})")]
+        for table in tables
+    }
+
+@st.cache_resource
+def get_database(version):
+    """
+    (connection, lock, schema) for one dataset version; queries are
+    serialized on the lock. The schema is read before the authorizer
+    locks PRAGMA out.
+    """
+    conn = _create_database()
+    tables = _read_schema(conn)
+    conn.set_authorizer(_read_only_authorizer)
+    return conn, threading.Lock(), tables
+
+def schema():
+    """Table name -> list of (column, type), for display."""
+    return get_database(dataset_version())[2]
+
+def _unique_columns(names):
+    """Suffix repeated column names (state, state.1, ...) as read_csv does; tables need unique names."""
+    seen = {}
+    unique = []
+    for name in names:
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        unique.append(f"{name}.{count}" if count else name)
+    return unique
+
+@st.cache_data(max_entries=256)
+def _run_query(sql, version):
+    conn, lock, _ = get_database(version)
+    with lock:
+        start = time.perf_counter()
+        deadline = start + QUERY_TIMEOUT_S
+        # Returning True from the handler interrupts the running statement
+        conn.set_progress_handler(lambda: time.perf_counter() > deadline, PROGRESS_STEPS)
+        try:
+            cursor = conn.execute(sql)
+            if cursor.description is None:
+                raise sqlite3.ProgrammingError("Only queries that return rows (SELECT / WITH) are allowed")
+            rows = cursor.fetchmany(MAX_ROWS + 1)
+            cursor.close()
+        except sqlite3.OperationalError as e:
+            if "interrupted" in str(e):
+                raise sqlite3.OperationalError(f"Query stopped after {QUERY_TIMEOUT_S:g} s; narrow it down or add a LIMIT") from e
+            raise
+        except sqlite3.DatabaseError as e:
+            if "not authorized" in str(e):
+                raise sqlite3.DatabaseError("Only read-only queries are allowed (writes, DDL, PRAGMA and ATTACH are not authorized)") from e
+            raise
+        finally:
+            conn.set_progress_handler(None, 0)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    truncated = len(rows) > MAX_ROWS
+    result = pd.DataFrame.from_records(rows[:MAX_ROWS], columns=_unique_columns(column[0] for column in cursor.description))
+    return result, truncated, elapsed_ms
+
+def run_query(sql):
+    """
+    Run a read-only query; returns (result, truncated, execution_ms, served_ms).
+
+    result holds at most MAX_ROWS rows; truncated is True if the query
+    returned more. execution_ms is the time SQLite took when the query was
+    first run; served_ms is this call's wall time, which is near zero on a
+    cache hit. Raises sqlite3.Error on invalid SQL, on anything but a
+    read-only query (writes, DDL, PRAGMA, ATTACH and transactions are
+    refused) and on queries running longer than QUERY_TIMEOUT_S.
+    """
+    start = time.perf_counter()
+    result, truncated, execution_ms = _run_query(sql.strip().rstrip(";"), dataset_version())
+    return result, truncated, execution_ms, (time.perf_counter() - start) * 1000
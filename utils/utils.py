@@ -1,6 +1,8 @@
 from io import BytesIO
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
+from utils.constants import state_colors
 
 def download_cleaned_data(df):
     """Generate downloadable CSV of cleaned data."""
@@ -77,4 +79,82 @@ def create_stacked_bar_chart(
         dragmode='zoom'
     )
     
-    return fig
\ No newline at end of file
+    return fig
+
+def create_revenue_bar_chart(data_year, year_selected):
+    """Create the horizontal revenue-by-state bar chart for a single year."""
+    fig_bar = px.bar(
+        data_year,
+        x="Value",
+        y="States",
+        orientation='h',
+        text="Initial",
+        color="States",
+        color_discrete_map=state_colors,
+        labels={"Value": "Revenue (₹ Crores)", "States": "State"},
+        template="plotly_white",
+        hover_data={"Value": ":,.0f", "Initial": True}
+    )
+    fig_bar.update_traces(textposition="outside", textfont_size=12)
+    fig_bar.update_layout(
+        yaxis=dict(autorange="reversed"),
+        xaxis=dict(separatethousands=True, tickprefix="₹"),
+        showlegend=False,
+        height=700,
+        margin=dict(l=150, r=50, t=50, b=50),
+        font=dict(family="Arial", size=14),
+        title_text=f"Revenue by State ({year_selected})",
+        title_font=dict(size=20, family="Arial")
+    )
+    return fig_bar
+
+def create_expenditure_bar_chart(df, title, state_order=None):
+    """Create the REx/CEx by state bar chart, largest first (or in a precomputed order)."""
+    if state_order is None:
+        state_order = df.sort_values("Value", ascending=False)["States"].tolist()
+    return px.bar(
+        df,
+        x="States",
+        y="Value",
+        color="States",
+        category_orders={"States": list(state_order)},
+        title=title
+    )
+
+
+def add_forecast_overlay(fig, forecasts, format_year=str):
+    """
+    Extend each line trace with a dashed forecast segment.
+
+    `forecasts` maps trace name -> (future years, values); the segment starts
+    at the trace's last actual point.
+    """
+    for trace in list(fig.data):
+        if trace.name not in forecasts or len(trace.x) == 0:
+            continue
+        years, values = forecasts[trace.name]
+        fig.add_trace(go.Scatter(
+            x=[trace.x[-1]] + [format_year(y) for y in years],
+            y=[trace.y[-1]] + list(values),
+            mode="lines+markers",
+            name=f"{trace.name} (forecast)",
+            line=dict(dash="dash", color=trace.line.color),
+            marker=dict(symbol="circle-open"),
+            legendgroup=trace.legendgroup or trace.name,
+            showlegend=False,
+            hovertemplate=f"<b>{trace.name}</b> (forecast)<br>%{{x}}: ₹%{{y:,.0f}}<extra></extra>"
+        ))
+    return fig
+
+def add_anomaly_markers(fig, x, y, labels, name="Anomaly"):
+    """Overlay flagged points as red open circles; `labels` become the hover text."""
+    fig.add_trace(go.Scatter(
+        x=list(x),
+        y=list(y),
+        mode="markers",
+        name=name,
+        marker=dict(symbol="circle-open", size=16, color="red", line=dict(width=2)),
+        text=list(labels),
+        hovertemplate="🚩 %{text}<br>%{x}: ₹%{y:,.0f}<extra></extra>"
+    ))
+    return fig